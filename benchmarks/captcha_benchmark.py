@@ -0,0 +1,76 @@
+"""Accuracy and throughput benchmark of the CAPTCHA recognizer.
+
+The CAPTCHAs are rendered offline from the templates, so no request
+is sent to sso.gzhmu.edu.cn. Run from the root of the project:
+
+    $ python -m benchmarks.captcha_benchmark
+    $ python -m benchmarks.captcha_benchmark -n 2000 --noise 0 0.1 0.3
+"""
+
+import time
+import argparse
+
+from gzhmu.captcha import Recognizer, generate
+
+
+def benchmark(recognizer: Recognizer, n: int, noise: float,
+              batch_size: int, seed: int) -> dict:
+    """Benchmark a recognizer on n generated images.
+
+    :param recognizer: The recognizer to benchmark.
+    :param n: The number of images.
+    :param noise: See gzhmu.captcha.render.
+    :param batch_size: The number of images per recognize_batch call.
+    :param seed: Seed of the random generator.
+    :return A dict of the accuracy and the images per second of
+        Recognizer.recognize and Recognizer.recognize_batch.
+    """
+    imgs, codes = generate(n, noise=noise, seed=seed)
+
+    start = time.perf_counter()
+    results = [recognizer.recognize(img) for img in imgs]
+    single_elapsed = time.perf_counter() - start
+    single_correct = sum(int(r == c) for r, c in zip(results, codes))
+
+    start = time.perf_counter()
+    batch_correct = 0
+    for i in range(0, n, batch_size):
+        results, _ = recognizer.recognize_batch(imgs[i:i+batch_size])
+        batch_correct += int((results == codes[i:i+batch_size]).sum())
+    batch_elapsed = time.perf_counter() - start
+
+    return {
+        'noise': noise,
+        'single_accuracy': single_correct / n,
+        'single_rate': n / single_elapsed,
+        'batch_accuracy': batch_correct / n,
+        'batch_rate': n / batch_elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-n', type=int, default=1000,
+                        help='number of images per noise level')
+    parser.add_argument('--noise', type=float, nargs='+',
+                        default=[0, 0.05, 0.1, 0.2, 0.3],
+                        help='noise levels to benchmark')
+    parser.add_argument('--batch-size', type=int, default=256,
+                        help='number of images per recognize_batch call')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    recognizer = Recognizer()
+    print('load time: %.3f ms' % ((time.perf_counter() - start) * 1000))
+
+    print('noise', 'accuracy', 'images/s', 'batch accuracy', 'batch images/s', sep='\t')
+    for noise in args.noise:
+        result = benchmark(recognizer, args.n, noise, args.batch_size, args.seed)
+        print('%.2f\t%.4f\t\t%.0f\t\t%.4f\t\t%.0f' % (result['noise'],
+              result['single_accuracy'], result['single_rate'],
+              result['batch_accuracy'], result['batch_rate']))
+
+
+if __name__ == '__main__':
+    main()
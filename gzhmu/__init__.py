@@ -5,6 +5,12 @@ This package contaning 3 modules which are gzhmu, gmuapi and gmulib. Use these m
 gzhmu.py mainly contains the basic login and web VPN functions.
 gmuapi.py contains the interfaces to campus network.
 gmulib.py contains the interfaces to access GMU library.
+store.py contains the session stores to resume login sessions across processes.
+aio.py contains the asyncio clients, which require aiohttp.
+collector.py contains the collector of the flow and balance time series.
+keepalive.py contains the daemon to keep a device logged in to the campus network.
+seatindex.py contains the index to search for free seats of the library.
+occupancy.py contains the occupancy matrix of the seats of the library for analytics.
 
 Below are some examples of gzhmu:
 
@@ -340,15 +346,26 @@ from .gzhmu  import InvalidUsernameException, InvalidPasswordException, \
                     Contact, Gzhmu, WebVPN
 from .gmuapi import IncorrectAccountOrPasswordException, AlreadyLoggedInException, \
                     FailedToGetUserInfoException, FailedToLoadOnlineDevicesException, \
-                    RequestException, UserInfo, Device
-from .gmuapi import balance_cvt, flow_cvt, request_api, login, loadUserInfo, \
-                    loadOnlineDevices, unbind, logout
+                    RequestException, UserInfo, Device, RateLimiter
+from .gmuapi import balance_cvt, flow_cvt, mac_cvt, create_api_session, get_api_session, \
+                    set_api_session, request_api, parse_jsonp, login, loadUserInfo, \
+                    loadOnlineDevices, iterOnlineDevices, record_to_device, \
+                    unbind, unbindAll, logout, checkStatus, run_bulk, loadUserInfoBulk, loadOnlineDevicesBulk, \
+                    get_api_cache, set_api_cache, cached_call, cachedLoadUserInfo, \
+                    cachedLoadOnlineDevices
 from .gmulib import TargetLibraryNotFoundException, TargetRoomNotFoundException, \
                     TargetSeatNotFoundException, NotLoggedInOrLoginExpiredException, \
                     ReserveException, ReserveConflictException, \
                     ReserveLessThan30MinutesException, \
                     Seat, Room, Library, Record, UserRecord, PrivateNewUserRecord, \
                     PrivateFinishedRecord, SeatInfo, CurrentUserInfo, GmuLib
+from .store  import SessionStore, FileSessionStore
+from .cache  import LRUCache, TTLCache
+from .aio    import AsyncGzhmu, AsyncWebVPN, AsyncGmuLib
+from .collector import FlowSample, FlowDelta, FlowCollector
+from .keepalive import KeepAliveMetrics, KeepAlive
+from .seatindex import SeatIndex
+from .occupancy import OccupancyMatrix
 
 
 __all__ = [
@@ -374,14 +391,32 @@ __all__ = [
     'RequestException', 
     'UserInfo', 
     'Device', 
+    'RateLimiter', 
     'balance_cvt', 
     'flow_cvt', 
+    'mac_cvt',
+    'create_api_session', 
+    'get_api_session', 
+    'set_api_session', 
     'request_api', 
+    'parse_jsonp', 
     'login', 
     'loadUserInfo', 
     'loadOnlineDevices', 
+    'iterOnlineDevices', 
+    'record_to_device', 
     'unbind', 
+    'unbindAll', 
     'logout',
+    'checkStatus',
+    'run_bulk',
+    'loadUserInfoBulk',
+    'loadOnlineDevicesBulk',
+    'get_api_cache',
+    'set_api_cache',
+    'cached_call',
+    'cachedLoadUserInfo',
+    'cachedLoadOnlineDevices',
     'TargetLibraryNotFoundException',
     'TargetRoomNotFoundException',
     'TargetSeatNotFoundException',
@@ -399,4 +434,18 @@ __all__ = [
     'SeatInfo',
     'CurrentUserInfo',
     'GmuLib',
+    'SessionStore',
+    'FileSessionStore',
+    'LRUCache',
+    'TTLCache',
+    'AsyncGzhmu',
+    'AsyncWebVPN',
+    'AsyncGmuLib',
+    'FlowSample',
+    'FlowDelta',
+    'FlowCollector',
+    'KeepAliveMetrics',
+    'KeepAlive',
+    'SeatIndex',
+    'OccupancyMatrix',
 ]
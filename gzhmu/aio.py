@@ -0,0 +1,475 @@
+"""asyncio counterparts of Gzhmu, WebVPN and GmuLib
+
+The clients have the same login flow and get/post surface as the
+blocking ones, but are built on aiohttp, so that one event loop can
+drive many sessions concurrently instead of one thread per session.
+aiohttp is an optional dependency, install it before using this module:
+
+    $ pip3 install aiohttp
+
+The CAPTCHA is recognized in an executor, so it doesn't block the
+event loop.
+
+Examples:
+
+    Log in the portal of many accounts concurrently with web VPN:
+
+        >>> import asyncio
+        >>> from gzhmu import AsyncWebVPN
+        >>> accounts = [('xxxxxxxxxx', 'xxxxxxxx'), ('yyyyyyyyyy', 'yyyyyyyy')]
+        >>> async def fetch(username, password):
+        ...     async with AsyncWebVPN(username, password) as vpn:
+        ...         await vpn.login()
+        ...         resp = await vpn.get('http://jwgl.gzhmu.edu.cn/jsxsd/')
+        ...         return await resp.text()
+        ...
+        >>> async def main():
+        ...     return await asyncio.gather(*(fetch(*a) for a in accounts))
+        ...
+        >>> pages = asyncio.run(main())
+"""
+
+import base64
+import asyncio
+from concurrent.futures import Executor
+from typing import Union, Optional, Tuple
+from urllib.parse import urlparse, urlunparse, urlsplit, urlencode, parse_qs
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .gzhmu import Gzhmu, EmptyUsernameException, EmptyPasswordException, \
+                   FailedToGetCaptchaImage, LoginFailedException, \
+                   LoginFailedMaxRetriesException, IncorrectVerificationCodeException, \
+                   InvalidUsernameException, InvalidPasswordException, \
+                   OnCampusNetworkException, NotOnCampusNetworkException
+from .captcha import recognize_png
+
+
+class AsyncGzhmu:
+    """asyncio version of Gzhmu.
+
+    The responses are aiohttp.ClientResponse objects whose body is
+    already read, so `await resp.text()`, `await resp.read()` and
+    `await resp.json()` return immediately. The aiohttp.ClientSession
+    is created on the first request, close it with AsyncGzhmu.close
+    or use the instance as an async context manager.
+
+    Note:
+    An instance must be used within a single event loop.
+
+    :param username: The username to log in the portal.
+    :param password: The password to log in the protal.
+    :param webvpn: Whether to use web VPN.
+    :param proxies: Use a proxy for every individual requests, in
+        the same format as Gzhmu, the proxy is chosen by the protocol
+        of the URL.
+    :param verify: Whether to verify server's TLS certificate.
+    :param timeout: Total timeout for every individual requests.
+    :param executor: The concurrent.futures.Executor to recognize
+        CAPTCHA, default to the default executor of the event loop.
+    """
+
+    def __init__(self, username: Optional[Union[None, str, int]] = None,
+                 password: Optional[Union[None, str]] = None,
+                 webvpn: Optional[bool] = False,
+                 proxies: Optional[Union[None, dict]] = None,
+                 verify: Optional[Union[None, bool]] = True,
+                 timeout: Optional[Union[int ,float]] = 10,
+                 executor: Optional[Union[None, Executor]] = None):
+        if aiohttp is None:
+            raise ImportError('aiohttp is required by %s, install it with `pip3 install aiohttp`'
+                              % type(self).__name__)
+        if username is not None:
+            self.set_username(username)
+        else:
+            self.__username = None
+        if password is not None:
+            self.set_password(password)
+        else:
+            self.__password = None
+
+        self.__webvpn = bool(webvpn)
+
+        if proxies is not None and isinstance(proxies, dict):
+            self.__proxies = proxies
+        else:
+            self.__proxies = None
+        self.__verify = bool(verify)
+        self.__timeout = float(timeout)
+        self.__executor = executor
+
+        self.__session = None
+        self.__ticket = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def get_username(self) -> str:
+        """Get the current username.
+
+        :returns A username.
+        """
+        return self.__username
+
+    def get_password(self) -> str:
+        """Get the current password.
+
+        :returns A password.
+        """
+        return self.__password
+
+    def set_username(self, username: Union[str, int]):
+        """Set a username.
+
+        :param username: A username to set.
+        """
+        if not Gzhmu.is_valid_username(username):
+            raise InvalidUsernameException()
+        self.__username = str(username)
+
+    def set_password(self, password: str):
+        """Set a password.
+
+        :param password: A password to set.
+        """
+        if not Gzhmu.is_valid_password(password):
+            raise InvalidPasswordException()
+        self.__password = str(password)
+
+    def get_session(self) -> 'aiohttp.ClientSession':
+        """Get the session object for each individual requests,
+        which is created if not yet.
+
+        :returns An aiohttp.ClientSession object.
+        """
+        if self.__session is None or self.__session.closed:
+            # The portal sets cookies on IP addresses as well.
+            cookie_jar = aiohttp.CookieJar(unsafe=True)
+            self.__session = aiohttp.ClientSession(cookie_jar=cookie_jar)
+        return self.__session
+
+    async def close(self):
+        """Close the session."""
+        if self.__session is not None and not self.__session.closed:
+            await self.__session.close()
+        self.__session = None
+
+    def is_webvpn(self) -> bool:
+        """Check if web VPN is enabled.
+
+        :returns True if web VPN is currently enabled or False if disabled.
+        """
+        return self.__webvpn
+
+    def set_webvpn(self, state: bool):
+        """Set whether to use web VPN or not.
+
+        :param state: True to enable web VPN or False to disable.
+        """
+        self.__webvpn = bool(state)
+
+    def get_proxies(self) -> dict:
+        """Get the currently in use proxies for each individual requests.
+
+        :returns The proxies.
+        """
+        return self.__proxies
+
+    def set_proxies(self, proxies: dict):
+        """Set the proxies for each individual requests.
+
+        :param proxies: The proxies to use.
+        """
+        if isinstance(proxies, dict):
+            self.__proxies = proxies
+
+    def is_verify(self) -> bool:
+        """Check whether to verify server's TLS certificate."""
+        return self.__verify
+
+    def set_verify(self, flag: bool):
+        """Set whether to verify server's TLS certificate."""
+        self.__verify = bool(flag)
+
+    def get_ticket(self) -> str:
+        """Get the ticket of the last login, or None if not logged in."""
+        return self.__ticket
+
+    async def get_login_html(self, service: Optional[str] = 'https://portal.gzhmu.edu.cn/portal/login/') -> str:
+        """Get the login HTML.
+
+        :param service: The service URL which is about to be authorized.
+        :returns The HTML text.
+        """
+        url = 'https://sso.gzhmu.edu.cn/cas/login?service=' + service
+        response = await self.get(url)
+        response_hostname = response.url.host
+        is_on_campus_network_needed = response_hostname != urlparse(url).hostname and response_hostname == 'webvpn.gzhmu.edu.cn'
+        if is_on_campus_network_needed and not self.__webvpn:
+            raise NotOnCampusNetworkException()
+        elif not is_on_campus_network_needed and self.__webvpn:
+            raise OnCampusNetworkException()
+        return await response.text()
+
+    async def get_captcha_img(self) -> bytes:
+        """Get the CAPTCHA image.
+
+        :returns The CAPTCHA image in binary and in PNG format.
+        """
+        url = 'https://sso.gzhmu.edu.cn/cas/captcha'
+        response = await self.get(url)
+        result = await response.json(content_type=None)
+        error_code = result.get('errorCode')
+        error_message = result.get('errorMessage')
+        if error_code != 'success' and error_message != 'success':
+            raise FailedToGetCaptchaImage('errorCode "%s", errorMessage "%s"' % (error_code, error_message))
+        data = result['data']
+        return base64.b64decode(data[data.index(',')+1:])
+
+    async def bypass_captcha_with_confidence(self) -> Tuple[int, float]:
+        """Bypass the captcha and tell how confident the result is.
+
+        The image is recognized in the executor.
+
+        :returns A tuple of the verification code and the confidence
+            ranging from 0 to 1. See gzhmu.captcha.recognize_png.
+        """
+        captcha_bytes = await self.get_captcha_img()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, recognize_png, captcha_bytes)
+
+    async def bypass_captcha(self, threshold: Optional[Union[None, float]] = None,
+                             max_refetches: Optional[int] = 5) -> int:
+        """Bypass the captcha.
+
+        See Gzhmu.bypass_captcha for more details.
+
+        :param threshold: The lowest acceptable confidence, ranging from 0 to 1.
+        :param max_refetches: The max number of times to fetch a new image.
+        :returns The verification code.
+        """
+        captcha_result, confidence = await self.bypass_captcha_with_confidence()
+        refetches = 0
+        while threshold is not None and confidence < threshold \
+                and refetches < max_refetches:
+            captcha_result, confidence = await self.bypass_captcha_with_confidence()
+            refetches += 1
+        return captcha_result
+
+    async def login(self, service: Optional[str] = 'https://portal.gzhmu.edu.cn/portal/login/',
+                    captcha_threshold: Optional[Union[None, float]] = None,
+                    max_captcha_refetches: Optional[int] = 5,
+                    max_retries: Optional[int] = 0) -> bool:
+        """Log in the portal and authorize the specific service.
+
+        See Gzhmu.login for the details of the arguments.
+
+        :returns Always True if log in successfully.
+        """
+        if self.__username is None:
+            raise EmptyUsernameException()
+        if self.__password is None:
+            raise EmptyPasswordException()
+        query = {'service': service}
+        login_url = 'https://sso.gzhmu.edu.cn/cas/login?' + urlencode(query)
+
+        login_html = await self.get_login_html(service)
+        execution = Gzhmu.get_execution(login_html, 'fm1')
+
+        # Logged in already.
+        if execution is None:
+            # Authorizate specific service.
+            await self.get(login_url, allow_redirects=False)
+            return True
+
+        captcha_result = await self.bypass_captcha(captcha_threshold, max_captcha_refetches)
+        retries = 0
+        while True:
+            # Post login form data
+            formdata = {
+                'username': self.__username,
+                'password': self.__password,
+                'captcha': str(captcha_result),
+                '_eventId': 'submit',
+                'geolocation': '',
+                'execution': execution,
+            }
+            response = await self.post(login_url, data=formdata, allow_redirects=self.__webvpn)
+
+            # Check login result
+            html = (await response.read()).decode('utf-8')
+            try:
+                Gzhmu.check_login_result(response.status, html)
+            except IncorrectVerificationCodeException:
+                if retries >= max_retries:
+                    if max_retries > 0:
+                        raise LoginFailedMaxRetriesException(max_retries)
+                    raise
+                # Stay in the same login flow, only the CAPTCHA is renewed.
+                retries += 1
+                execution = Gzhmu.get_execution(html, 'fm1') or execution
+                captcha_result = await self.bypass_captcha(captcha_threshold, max_captcha_refetches)
+                continue
+            break
+
+        # Authorize Web VPN
+        if self.__webvpn:
+            response = await self.get(str(response.url), allow_redirects=False)
+            await self.get(str(response.url))
+            response = await self.get(login_url, allow_redirects=False)
+
+        # Get login ticket
+        is_first_ticket = True
+        while response.status in [301, 302]:
+            location = response.headers['Location']
+            parsed_url = urlparse(str(response.url))
+            parsed_location = urlparse(location)
+            if parsed_location.netloc == '':
+                location = urlunparse(parsed_url[:2]+parsed_location[2:])
+
+            ticket = parse_qs(parsed_location.query).get('ticket')
+            if ticket is not None and is_first_ticket:
+                self.__ticket = ticket[0]
+                is_first_ticket = False
+            response = await self.get(location, allow_redirects=False)
+
+        if response.status not in [200, 301, 302]:
+            raise LoginFailedException('unknow failure, alert message not found')
+
+        return True
+
+    async def logout(self):
+        """Log out the account."""
+        if self.__webvpn is True:
+            url = 'https://webvpn.gzhmu.edu.cn/logout'
+            await self.get(url)
+            self.__ticket = None
+            self.get_session().cookie_jar.clear()
+            return
+
+        if self.__ticket is None:
+            return
+
+        url = 'https://sso.gzhmu.edu.cn/cas/logout?service=https://portal.gzhmu.edu.cn/portal/home/'
+        await self.get(url)
+
+        self.__ticket = None
+        self.get_session().cookie_jar.clear()
+
+    async def request(self, method: str, url: str,
+                      use_encrypt: Optional[Union[None, bool]] = None,
+                      **kwargs) -> 'aiohttp.ClientResponse':
+        """Send a request.
+
+        See Gzhmu.request for how the URL is encrypted. The arguments
+        timeout, proxies and verify of requests are accepted as well,
+        and converted into those of aiohttp.
+
+        :param method: The request method.
+        :param url: The URL to request.
+        :param use_encrypt: Determinte whether to use URL encryption.
+        :param kwargs: Argumenets for aiohttp.ClientSession.request method.
+        :returns An aiohttp.ClientResponse object whose body is read.
+        """
+        if use_encrypt is None:
+            if not urlparse(url).hostname == 'webvpn.gzhmu.edu.cn' \
+                    and self.__webvpn:
+                url = Gzhmu.encrypt_url(url)
+        elif use_encrypt:
+            url = Gzhmu.encrypt_url(url)
+        if kwargs.get('headers') is None:
+            kwargs['headers'] = Gzhmu.headers
+
+        timeout = kwargs.pop('timeout', None)
+        if timeout is None:
+            timeout = self.__timeout
+        if not isinstance(timeout, aiohttp.ClientTimeout):
+            timeout = aiohttp.ClientTimeout(total=timeout)
+        kwargs['timeout'] = timeout
+
+        proxies = kwargs.pop('proxies', None)
+        if proxies is None:
+            proxies = self.__proxies
+        if kwargs.get('proxy') is None and proxies:
+            kwargs['proxy'] = proxies.get(urlsplit(url).scheme)
+
+        verify = kwargs.pop('verify', None)
+        if verify is None:
+            verify = self.__verify
+        if not verify and kwargs.get('ssl') is None:
+            kwargs['ssl'] = False
+
+        response = await self.get_session().request(method, url, **kwargs)
+        # Read the body and release the connection back to the pool.
+        await response.read()
+        return response
+
+    async def get(self, url: str,
+                  use_encrypt: Optional[Union[None, bool]] = None,
+                  **kwargs) -> 'aiohttp.ClientResponse':
+        """Send a GET request.
+
+        See the AsyncGzhmu.request method for more details.
+        """
+        return await self.request('GET', url, use_encrypt, **kwargs)
+
+    async def post(self, url: str,
+                   use_encrypt: Optional[Union[None, bool]] = None,
+                   **kwargs) -> 'aiohttp.ClientResponse':
+        """Send a POST request.
+
+        See the AsyncGzhmu.request method for more details.
+        """
+        return await self.request('POST', url, use_encrypt, **kwargs)
+
+
+class AsyncWebVPN(AsyncGzhmu):
+    """AsyncGzhmu with Web VPN.
+
+    Alternative for AsyncGzhmu(username, password, webvpn=True)
+
+    :param username: The username to log in the portal.
+    :param password: The passwrod to log in the portal.
+    :param proxies: Use a proxy for every individual requests.
+    :param verify: Whether to verify server's TLS certificate.
+    :param timeout: Total timeout for every individual requests.
+    :param executor: The concurrent.futures.Executor to recognize CAPTCHA.
+    """
+    def __init__(self, username: Optional[Union[None, str, int]] = None,
+                 password: Optional[Union[None, str]] = None,
+                 proxies: Optional[Union[None, dict]] = None,
+                 verify: Optional[Union[None, bool]] = True,
+                 timeout: Optional[Union[int ,float]] = 10,
+                 executor: Optional[Union[None, Executor]] = None):
+        super().__init__(username, password, webvpn=True, proxies=proxies, verify=verify,
+                         timeout=timeout, executor=executor)
+
+
+class AsyncGmuLib(AsyncGzhmu):
+    """asyncio version of the login of GmuLib.
+
+    After login, access the library website with get and post.
+
+    :param username: The username to log in the portal.
+    :param password: The password to log in the portal.
+    :param webvpn: Whether to use web VPN.
+    :param proxies: Use a proxy for every individual requests.
+    :param verify: Whether to verify server's TLS certificate.
+    :param timeout: Total timeout for every individual requests.
+    :param executor: The concurrent.futures.Executor to recognize CAPTCHA.
+    """
+
+    async def login(self, **kwargs) -> bool:
+        """Login library website.
+
+        :param kwargs: Arguments for AsyncGzhmu.login method except service.
+        :return Always True if log in successfully.
+        """
+        url = 'http://ggyy.gzhmu.edu.cn'
+        return await super().login(service=url, **kwargs)
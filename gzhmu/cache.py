@@ -0,0 +1,224 @@
+import time
+import threading
+from concurrent.futures import Future
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Hashable, Optional
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUCache:
+    """A thread-safe bounded cache which evicts the least recently used entries.
+
+    :param maxsize: The max number of entries.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 256):
+        self.__maxsize = int(maxsize)
+        self.__data = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Get the value of a key and count a hit or a miss.
+
+        :param key: The key.
+        :param default: The value to return if the key is not cached.
+        :return The cached value or default.
+        """
+        with self.__lock:
+            try:
+                value = self.__data[key]
+            except KeyError:
+                self.__misses += 1
+                return default
+            self.__data.move_to_end(key)
+            self.__hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Cache a value, evicting the least recently used entries if full.
+
+        :param key: The key.
+        :param value: The value.
+        """
+        with self.__lock:
+            self.__data[key] = value
+            self.__data.move_to_end(key)
+            while len(self.__data) > self.__maxsize:
+                self.__data.popitem(last=False)
+
+    def clear(self):
+        """Remove all the entries and reset the counters."""
+        with self.__lock:
+            self.__data.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def get_maxsize(self) -> int:
+        """Get the max number of entries."""
+        return self.__maxsize
+
+    def set_maxsize(self, maxsize: int):
+        """Set the max number of entries, evicting entries if needed."""
+        with self.__lock:
+            self.__maxsize = int(maxsize)
+            while len(self.__data) > self.__maxsize:
+                self.__data.popitem(last=False)
+
+    def get_info(self) -> CacheInfo:
+        """Get the hits, misses, max size and current size of the cache.
+
+        :return A CacheInfo named tuple.
+        """
+        with self.__lock:
+            return CacheInfo(self.__hits, self.__misses,
+                             self.__maxsize, len(self.__data))
+
+    def __len__(self):
+        return len(self.__data)
+
+
+TTLCacheInfo = namedtuple('TTLCacheInfo', ['hits', 'stale_hits', 'misses', 'maxsize', 'currsize',
+                                           'reload_errors'])
+
+
+class TTLCache:
+    """A thread-safe bounded cache whose entries expire after a TTL.
+
+    Values are loaded through TTLCache.get_or_load. An expired entry
+    is still served within stale_ttl after expiry while it is reloaded
+    in a background thread, and concurrent loads of the same key are
+    collapsed into one call of the loader. Exceptions of the loader
+    are not cached. The exceptions of the background reloads are
+    counted in TTLCache.get_info, and the last one is kept by
+    TTLCache.get_last_error.
+
+    :param ttl: The seconds an entry is fresh for.
+    :param maxsize: The max number of entries, the least recently used
+        entries are evicted.
+    :param stale_ttl: The seconds an expired entry is served for while
+        it is reloaded, 0 to disable and None for no limit. Once it is
+        passed, the entry is loaded in the foreground again, so the
+        errors of the loader reach the caller.
+    :param timer: The clock in seconds.
+    """
+
+    def __init__(self, ttl: float = 60, maxsize: Optional[int] = 1024,
+                 stale_ttl: Optional[float] = 180,
+                 timer: Callable[[], float] = time.monotonic):
+        self.__ttl = float(ttl)
+        self.__maxsize = int(maxsize)
+        self.__stale_ttl = stale_ttl
+        self.__timer = timer
+        # key -> (value, expiry time)
+        self.__data = OrderedDict()
+        # key -> Future of the running load
+        self.__loading = {}
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__stale_hits = 0
+        self.__misses = 0
+        self.__reload_errors = 0
+        self.__last_error = None
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Get the value of a key, loading it with loader if needed.
+
+        :param key: The key.
+        :param loader: The function without arguments to load the value.
+        :return The cached, stale or loaded value.
+        """
+        with self.__lock:
+            now = self.__timer()
+            entry = self.__data.get(key)
+            if entry is not None:
+                value, expiry = entry
+                if now < expiry:
+                    self.__data.move_to_end(key)
+                    self.__hits += 1
+                    return value
+                if self.__stale_ttl is None or now < expiry + self.__stale_ttl:
+                    self.__data.move_to_end(key)
+                    self.__stale_hits += 1
+                    if key not in self.__loading:
+                        self.__loading[key] = Future()
+                        threading.Thread(target=self.__load, args=(key, loader, True),
+                                         daemon=True).start()
+                    return value
+            self.__misses += 1
+            future = self.__loading.get(key)
+            is_loader = future is None
+            if is_loader:
+                future = self.__loading[key] = Future()
+        if is_loader:
+            self.__load(key, loader)
+        return future.result()
+
+    def __load(self, key: Hashable, loader: Callable[[], Any],
+               background: Optional[bool] = False):
+        """Call loader, cache the value and resolve the Future of the key."""
+        future = self.__loading[key]
+        try:
+            value = loader()
+        except BaseException as e:
+            with self.__lock:
+                del self.__loading[key]
+                if background:
+                    self.__reload_errors += 1
+                    self.__last_error = e
+            future.set_exception(e)
+            return
+        with self.__lock:
+            self.__data[key] = (value, self.__timer() + self.__ttl)
+            self.__data.move_to_end(key)
+            while len(self.__data) > self.__maxsize:
+                self.__data.popitem(last=False)
+            del self.__loading[key]
+        future.set_result(value)
+
+    def invalidate(self, key: Hashable):
+        """Remove an entry, so the next get_or_load loads it again."""
+        with self.__lock:
+            self.__data.pop(key, None)
+
+    def clear(self):
+        """Remove all the entries and reset the counters."""
+        with self.__lock:
+            self.__data.clear()
+            self.__hits = 0
+            self.__stale_hits = 0
+            self.__misses = 0
+            self.__reload_errors = 0
+            self.__last_error = None
+
+    def get_ttl(self) -> float:
+        """Get the seconds an entry is fresh for."""
+        return self.__ttl
+
+    def get_maxsize(self) -> int:
+        """Get the max number of entries."""
+        return self.__maxsize
+
+    def get_stale_ttl(self) -> Optional[float]:
+        """Get the seconds an expired entry is served for, None for no limit."""
+        return self.__stale_ttl
+
+    def get_last_error(self) -> Optional[BaseException]:
+        """Get the exception of the last failed background reload, None if none."""
+        return self.__last_error
+
+    def get_info(self) -> TTLCacheInfo:
+        """Get the hits, stale hits, misses, max size, current size and
+        background reload errors of the cache.
+
+        :return A TTLCacheInfo named tuple.
+        """
+        with self.__lock:
+            return TTLCacheInfo(self.__hits, self.__stale_hits, self.__misses,
+                                self.__maxsize, len(self.__data), self.__reload_errors)
+
+    def __len__(self):
+        return len(self.__data)
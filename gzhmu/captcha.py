@@ -1,7 +1,279 @@
 import os
+from io import BytesIO
+from typing import Optional, Tuple, Union
+
 import numpy as np
+from PIL import Image
+
+pattern_data = os.path.join(os.path.split(__file__)[0], 'data.npy')
+legacy_pattern_data = os.path.join(os.path.split(__file__)[0], 'data.pk')
+
+SIGNS = ('add', 'minus', 'multiply')
+
+
+def build_masks(pattern: dict) -> np.ndarray:
+    """Turn the legacy pattern data into boolean masks.
+
+    The masks are stacked as the left operands, the signs in the 
+    order of SIGNS and the right operands, which are the left operands 
+    shifted by the gap.
+
+    :param pattern: The legacy pattern data, a dict of `left_operand`, 
+        `sign` and `gap`.
+    :return Boolean masks of shape (K, H, W).
+    """
+    digits = pattern['left_operand']
+    gap = pattern['gap']
+    templates = [(n, 0) for n in digits] \
+              + [(pattern['sign'][s], 0) for s in SIGNS] \
+              + [(n, gap) for n in digits]
+    height = max(r for n, _ in templates for r in n) + 1
+    width = max(c + offset for n, offset in templates
+                for cols in n.values() for c in cols) + 1
+
+    masks = np.zeros((len(templates), height, width), dtype=bool)
+    for i, (n, offset) in enumerate(templates):
+        for r, cols in n.items():
+            masks[i, r, np.asarray(cols) + offset] = True
+    return masks
+
+
+def convert_pattern_data(src: Optional[str] = legacy_pattern_data, 
+                         dst: Optional[str] = pattern_data):
+    """Convert the pickled pattern data into a packed bitmask file.
+
+    The result is a plain .npy file of uint8 of shape (K, H, ceil(W/8)), 
+    with the masks of build_masks packed along the rows, which can be 
+    memory-mapped and needs no unpickling.
+
+    :param src: Path to the legacy pickled pattern data.
+    :param dst: Path to save the packed bitmask file.
+    """
+    pattern = np.load(src, allow_pickle=True)
+    np.save(dst, np.packbits(build_masks(pattern), axis=-1))
+
+
+def load_pattern_data(path: Optional[str] = pattern_data, 
+                      mmap_mode: Optional[str] = 'r') -> np.ndarray:
+    """Load the packed bitmask file.
+
+    :param path: Path to the packed bitmask file.
+    :param mmap_mode: See numpy.load. Memory-mapped read-only by default, 
+        so that forked processes share one copy of the templates.
+    :return Packed masks of shape (K, H, ceil(W/8)).
+    """
+    packed = np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+    if packed.dtype != np.uint8 or packed.ndim != 3 \
+            or len(packed) <= len(SIGNS) or (len(packed) - len(SIGNS)) % 2:
+        raise ValueError('invalid pattern data "%s"' % path)
+    return packed
+
+
+def unpack_pattern_data(packed: np.ndarray) -> np.ndarray:
+    """Unpack the packed masks, dropping the padding columns.
+
+    :param packed: Packed masks of shape (K, H, ceil(W/8)).
+    :return Boolean masks of shape (K, H, W).
+    """
+    masks = np.unpackbits(packed, axis=-1).astype(bool)
+    width = np.flatnonzero(masks.any(axis=(0, 1))).max() + 1
+    return masks[..., :width]
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """Count the set bits of every byte.
+
+    :param bits: An array of uint8.
+    :return An array of the same shape with the number of set bits.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits)
+    return _popcount_table[bits]
+
+
+_popcount_table = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def decode(png: bytes) -> np.ndarray:
+    """Decode a CAPTCHA image straight to a packed ink bitmap.
+
+    A pixel counts as ink if the sum of its channels is less than 765, 
+    i.e. if it is not pure white. Images of other modes are converted 
+    to RGB first, which the CAPTCHAs are, and the decoded pixels are 
+    read in place. A pixel is white only if the bitwise and of its 
+    channels is 255, so no channel sum is needed.
+
+    :param png: The image in binary, usually in PNG format.
+    :return A bitmap of shape (H, ceil(W/8)) in uint8 with the rows 
+        packed as numpy.packbits does.
+    """
+    image = Image.open(BytesIO(png))
+    if image.mode != 'RGB':
+        # e.g. an alpha channel would be summed into the channels.
+        image = image.convert('RGB')
+    pixels = np.frombuffer(image.tobytes(), dtype=np.uint8)
+    return ink_bitmap(pixels.reshape(image.height, image.width, 3))
+
+
+def ink_bitmap(img: np.ndarray) -> np.ndarray:
+    """Get the packed ink bitmap of images.
+
+    :param img: An image of shape (H, W, C), or a stack of images.
+    :return A bitmap of shape (H, ceil(W/8)), or a stack of bitmaps, 
+        with the rows packed as numpy.packbits does.
+    """
+    if img.dtype == np.uint8 and img.shape[-1] == 3:
+        ink = (img[..., 0] & img[..., 1] & img[..., 2]) != 255
+    else:
+        ink = img.sum(axis=-1, dtype=np.int64) < 765
+    return np.packbits(ink, axis=-1)
+
+
+class Recognizer:
+    """CAPTCHA recognizer.
+
+    The pattern data is loaded only once as packed bitmasks, and all 
+    the templates of the left operand, the sign and the right operand 
+    are scored at once by counting the bits shared with the packed 
+    ink bitmap of the image, instead of looping over every pixel.
+
+    :param path: Path to the packed bitmask file.
+    """
+    def __init__(self, path: Optional[str] = pattern_data):
+        packed = load_pattern_data(path)
+        masks = unpack_pattern_data(packed)
+
+        self.__digits = (len(masks) - len(SIGNS)) // 2
+        self.__signs = SIGNS
+        self.__shape = masks.shape[1:]
+        self.__masks = packed[..., :(self.__shape[1] + 7) // 8]
+        self.__totals = popcount(self.__masks).sum(axis=(1, 2), dtype=np.int64) \
+                                              .astype(np.float64)
+
+    def get_shape(self) -> tuple:
+        """Get the (height, width) of the area covered by the templates."""
+        return self.__shape
+
+    def match(self, img: np.ndarray) -> np.ndarray:
+        """Get the match rate of every template.
+
+        A pixel counts as ink if the sum of its channels is less
+        than 765, i.e. if it is not pure white.
 
-pattern_data = os.path.join(os.path.split(__file__)[0], 'data.pk')
+        :param img: An image of shape (H, W, 3), or a stack of images
+            of shape (N, H, W, 3).
+        :return The match rates of the left operands, the signs and
+            the right operands, in that order, along the last axis.
+        """
+        height, width = self.__shape
+        if img.shape[-3] < height or img.shape[-2] < width:
+            raise ValueError('image of shape %s is smaller than the patterns %s'
+                             % (img.shape, self.__shape))
+        return self.match_bitmap(ink_bitmap(img[..., :height, :width, :]))
+
+    def match_bitmap(self, bitmap: np.ndarray) -> np.ndarray:
+        """Get the match rate of every template from packed ink bitmaps.
+
+        :param bitmap: A bitmap of shape (H, ceil(W/8)) from decode, 
+            or a stack of them of shape (N, H, ceil(W/8)).
+        :return The match rates of the left operands, the signs and
+            the right operands, in that order, along the last axis.
+        """
+        height, nbytes = self.__masks.shape[1:]
+        if bitmap.shape[-2] < height or bitmap.shape[-1] < nbytes:
+            raise ValueError('bitmap of shape %s is smaller than the patterns %s'
+                             % (bitmap.shape, self.__shape))
+        bits = bitmap[..., np.newaxis, :height, :nbytes] & self.__masks
+        scores = popcount(bits).sum(axis=(-2, -1), dtype=np.int64)
+        return scores / self.__totals
+
+    def recognize(self, img: np.ndarray) -> int:
+        """Resolve the CAPTCHA.
+
+        :param img: An image.
+        :return An verification code.
+        """
+        code, _ = self.recognize_with_confidence(img)
+        return code
+
+    def recognize_with_confidence(self, img: np.ndarray) -> Tuple[int, float]:
+        """Resolve the CAPTCHA and tell how confident the result is.
+
+        :param img: An image.
+        :return A tuple of the verification code and the confidence, 
+            which is the lowest of the best match rates of the left 
+            operand, the sign and the right operand, ranging from 0 to 1.
+        """
+        codes, rates = self.recognize_batch(img[np.newaxis])
+        return int(codes[0]), float(rates[0].min())
+
+    def recognize_batch(self, imgs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Resolve a stack of CAPTCHAs at once.
+
+        :param imgs: Images of shape (N, H, W, 3).
+        :return A tuple of the N verification codes and an (N, 3) array 
+            of the best match rates of the left operand, the sign and 
+            the right operand of each image.
+        """
+        return self.__resolve(self.match(imgs))
+
+    def recognize_png(self, png: bytes) -> Tuple[int, float]:
+        """Resolve the CAPTCHA image in binary.
+
+        The image is decoded straight to a packed ink bitmap by decode.
+
+        :param png: The image in binary, usually in PNG format.
+        :return A tuple of the verification code and the confidence. 
+            See Recognizer.recognize_with_confidence.
+        """
+        codes, rates = self.__resolve(self.match_bitmap(decode(png)[np.newaxis]))
+        return int(codes[0]), float(rates[0].min())
+
+    def __resolve(self, rates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the verification codes from the match rates of shape (N, K).
+
+        See Recognizer.recognize_batch for the result.
+        """
+        digits = self.__digits
+        left, left_rate = Recognizer.__best(rates[:, :digits])
+        sign, sign_rate = Recognizer.__best(rates[:, digits:-digits])
+        right, right_rate = Recognizer.__best(rates[:, -digits:])
+
+        results = {
+            'add': left + right,
+            'minus': left - right,
+            'multiply': left * right,
+        }
+        codes = np.zeros(len(rates), dtype=np.int64)
+        for i, s in enumerate(self.__signs):
+            if s in results:
+                codes = np.where(sign == i + 1, results[s], codes)
+        return codes, np.stack((left_rate, sign_rate, right_rate), axis=1)
+
+    @staticmethod
+    def __best(rates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the 1-based indices of the first best matches, or 0 if nothing matches.
+
+        :param rates: Match rates of shape (N, K).
+        :return A tuple of the indices and the best match rates.
+        """
+        best = rates.argmax(axis=1)
+        best_rate = rates[np.arange(len(rates)), best]
+        return np.where(best_rate > 0, best + 1, 0), best_rate
+
+
+_recognizer = None
+
+
+def get_recognizer() -> Recognizer:
+    """Get the shared recognizer, which is created on first use.
+
+    :return A Recognizer object.
+    """
+    global _recognizer
+    if _recognizer is None:
+        _recognizer = Recognizer()
+    return _recognizer
 
 
 def recognize(img: np.ndarray) -> int:
@@ -10,61 +282,114 @@ def recognize(img: np.ndarray) -> int:
     :param img: An image.
     :return An verification code.
     """
-    pattern = np.load(pattern_data, allow_pickle=True)
+    return get_recognizer().recognize(img)
 
-    left = 0
-    max_rate = 0
-    for i, n in enumerate(pattern['left_operand']):
-        score = 0
-        total = 0
-        for r, cols in n.items():
-            for c in cols:
-                score += sum(img[r,c]) < 765
-            total += len(cols)
-        rate = score / total
-        if rate > max_rate:
-            left = i + 1
-            if rate == 1:
-                break
-            max_rate = rate
-
-    sign = ''
-    max_rate = 0
-    for s, n in pattern['sign'].items():
-        score = 0
-        total = 0
-        for r, cols in n.items():
-            for c in cols:
-                score += sum(img[r,c]) < 765
-            total += len(cols)
-        rate = score / total
-        if rate > max_rate:
-            sign = s
-            if rate == 1:
-                break
-            max_rate = rate
-
-    right = 0
-    max_rate = 0
-    for i, n in enumerate(pattern['left_operand']):
-        score = 0
-        total = 0
-        for r, cols in n.items():
-            for c in cols:
-                score += sum(img[r,c+pattern['gap']]) < 765
-            total += len(cols)
-        rate = score / total
-        if rate > max_rate:
-            right = i + 1
-            if rate == 1:
-                break
-            max_rate = rate
-
-    if sign == 'add':
-        return left + right
-    elif sign == 'minus':
-        return left - right
-    elif sign == 'multiply':
-        return left * right
-    else:
-        return 0
+
+def recognize_with_confidence(img: np.ndarray) -> Tuple[int, float]:
+    """Resolve the CAPTCHA and tell how confident the result is.
+
+    See Recognizer.recognize_with_confidence for more details.
+    """
+    return get_recognizer().recognize_with_confidence(img)
+
+
+def recognize_png(png: bytes) -> Tuple[int, float]:
+    """Resolve the CAPTCHA image in binary.
+
+    See Recognizer.recognize_png for more details.
+    """
+    return get_recognizer().recognize_png(png)
+
+
+def recognize_batch(imgs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Resolve a stack of CAPTCHAs at once.
+
+    :param imgs: Images of shape (N, H, W, 3).
+    :return A tuple of the N verification codes and an (N, 3) array 
+        of the best match rates of the left operand, the sign and 
+        the right operand of each image.
+    """
+    return get_recognizer().recognize_batch(imgs)
+
+
+def render(left: int, sign: str, right: int, 
+           shape: Optional[Union[None, Tuple[int, int]]] = None, 
+           noise: Optional[float] = 0, 
+           rng: Optional[Union[None, np.random.Generator]] = None, 
+           masks: Optional[Union[None, np.ndarray]] = None) -> np.ndarray:
+    """Render a CAPTCHA-like image from the templates.
+
+    The operands and the sign are drawn in random dark colors on a 
+    white background, with the right operand shifted by the gap.
+
+    :param left: The left operand, from 1 to 9.
+    :param sign: One of SIGNS.
+    :param right: The right operand, from 1 to 9.
+    :param shape: The (height, width) of the image. Default to the area 
+        covered by the templates plus a margin of 8 pixels.
+    :param noise: The fraction of the pixels to replace with random 
+        colors and the fraction of the ink to drop, from 0 to 1.
+    :param rng: A numpy.random.Generator.
+    :param masks: Boolean masks from unpack_pattern_data. Default to 
+        the shipped templates.
+    :return An image of shape (H, W, 3) in uint8.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if masks is None:
+        masks = unpack_pattern_data(load_pattern_data())
+    digits = (len(masks) - len(SIGNS)) // 2
+    if not 1 <= left <= digits or not 1 <= right <= digits:
+        raise ValueError('operands should range from 1 to %d' % digits)
+    if shape is None:
+        shape = (masks.shape[1] + 8, masks.shape[2] + 8)
+    height, width = masks.shape[1:]
+    if shape[0] < height or shape[1] < width:
+        raise ValueError('shape %s is smaller than the patterns %s' 
+                         % (shape, (height, width)))
+
+    ink = np.zeros(shape, dtype=bool)
+    ink[:height, :width] = masks[left-1] \
+                         | masks[digits+SIGNS.index(sign)] \
+                         | masks[-digits+right-1]
+    img = np.full(shape + (3,), 255, dtype=np.uint8)
+    img[ink] = rng.integers(0, 200, (ink.sum(), 3), dtype=np.uint8)
+    if noise > 0:
+        speckles = rng.random(shape) < noise
+        img[speckles] = rng.integers(0, 256, (speckles.sum(), 3), dtype=np.uint8)
+        dropouts = ink & (rng.random(shape) < noise)
+        img[dropouts] = 255
+    return img
+
+
+def generate(n: int, noise: Optional[float] = 0, 
+             shape: Optional[Union[None, Tuple[int, int]]] = None, 
+             seed: Optional[Union[None, int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Generate random CAPTCHA-like images with their verification codes.
+
+    The operands cover the whole digit range and the signs cover 
+    all the operators. See render for more details.
+
+    :param n: The number of images.
+    :param noise: See render.
+    :param shape: See render.
+    :param seed: Seed of the random generator.
+    :return A tuple of images of shape (N, H, W, 3) and the N 
+        verification codes.
+    """
+    rng = np.random.default_rng(seed)
+    masks = unpack_pattern_data(load_pattern_data())
+    digits = (len(masks) - len(SIGNS)) // 2
+    operations = {
+        'add': lambda a, b: a + b,
+        'minus': lambda a, b: a - b,
+        'multiply': lambda a, b: a * b,
+    }
+    imgs = []
+    codes = []
+    for _ in range(n):
+        left, right = rng.integers(1, digits + 1, 2)
+        sign = SIGNS[rng.integers(len(SIGNS))]
+        imgs.append(render(left, sign, right, shape, noise, rng, masks))
+        codes.append(operations[sign](left, right))
+    return np.stack(imgs), np.array(codes, dtype=np.int64)
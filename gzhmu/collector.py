@@ -0,0 +1,241 @@
+"""Flow and balance time series of campus network accounts
+
+FlowCollector polls loadUserInfo of a set of accounts on a schedule and
+stores the balance, the used flow and the available flow in SQLite,
+in a table clustered by account and time. A sample is only written
+when the values of an account change, so the values of a sample hold
+until the next sample of the same account.
+
+Examples:
+
+    Poll every 5 minutes in a background thread:
+
+        >>> import threading
+        >>> from gzhmu import FlowCollector
+        >>> collector = FlowCollector('flow.db', ['xxxxxxxxxx', 'yyyyyyyyyy'])
+        >>> thread = threading.Thread(target=collector.run, args=(300,), daemon=True)
+        >>> thread.start()
+
+    Get the flow used per hour of the last day:
+
+        >>> import time
+        >>> now = int(time.time())
+        >>> for delta in collector.deltas('xxxxxxxxxx', 3600, now - 86400, now):
+        ...     print(time.ctime(delta.start), delta.use_flow, 'MB')
+        ...
+"""
+
+import time
+import bisect
+import sqlite3
+import threading
+from collections import namedtuple
+from typing import Union, Optional, Iterable, List, Dict
+
+from .gmuapi import UserInfo, RateLimiter, loadUserInfoBulk
+
+
+FlowSample = namedtuple('FlowSample', ['ts', 'balance', 'use_flow', 'available_flow'])
+FlowDelta = namedtuple('FlowDelta', ['start', 'end', 'balance', 'use_flow', 'available_flow'])
+
+
+class FlowCollector:
+    """Collect the flow and balance of accounts into SQLite.
+
+    The samples are stored in a WITHOUT ROWID table whose primary key
+    is (account, ts), so a range query of an account reads adjacent
+    rows only. ts is in seconds since the epoch, the flows are in MB
+    and the balance is in Yuan.
+
+    :param path: The path of the SQLite database, or ':memory:'.
+    :param accounts: The accounts to poll.
+    :param max_workers: The max number of threads to poll with.
+    :param rate_limit: The max number of requests per second, or a
+        gzhmu.gmuapi.RateLimiter. No limit if None.
+    :param webvpn: An object of gzhmu.Gzhmu class to poll via web VPN.
+    :param kwargs: Arguments for gzhmu.gmuapi.loadUserInfo.
+    """
+
+    def __init__(self, path: str,
+                 accounts: Optional[Iterable[Union[str, int]]] = (),
+                 max_workers: Optional[int] = 8,
+                 rate_limit: Optional[Union[None, float, RateLimiter]] = None,
+                 webvpn=None, **kwargs):
+        self.__accounts = [str(account) for account in accounts]
+        self.__max_workers = max_workers
+        self.__rate_limit = rate_limit
+        self.__webvpn = webvpn
+        self.__kwargs = kwargs
+        self.__errors = {}
+        self.__stop_event = threading.Event()
+
+        self.__lock = threading.Lock()
+        self.__conn = sqlite3.connect(path, check_same_thread=False)
+        with self.__conn:
+            if path != ':memory:':
+                self.__conn.execute('PRAGMA journal_mode=WAL')
+            self.__conn.execute('CREATE TABLE IF NOT EXISTS flow ('
+                                'account TEXT NOT NULL, '
+                                'ts INTEGER NOT NULL, '
+                                'balance REAL NOT NULL, '
+                                'use_flow REAL NOT NULL, '
+                                'available_flow REAL NOT NULL, '
+                                'PRIMARY KEY (account, ts)) WITHOUT ROWID')
+        # The latest values per account, to skip unchanged samples.
+        self.__latest = {}
+        rows = self.__conn.execute('SELECT account, balance, use_flow, available_flow, MAX(ts) '
+                                   'FROM flow GROUP BY account')
+        for account, balance, use_flow, available_flow, _ in rows:
+            self.__latest[account] = (balance, use_flow, available_flow)
+
+    def get_accounts(self) -> List[str]:
+        """Get the accounts to poll."""
+        return list(self.__accounts)
+
+    def set_accounts(self, accounts: Iterable[Union[str, int]]):
+        """Set the accounts to poll."""
+        self.__accounts = [str(account) for account in accounts]
+
+    def get_errors(self) -> Dict[str, Exception]:
+        """Get the exceptions raised by the accounts in the last poll."""
+        return dict(self.__errors)
+
+    def add(self, user_info: UserInfo, ts: Optional[Union[None, int]] = None) -> bool:
+        """Add a sample unless the values are the same as the latest sample.
+
+        :param user_info: An object of gzhmu.gmuapi.UserInfo.
+        :param ts: The time of the sample, default to now.
+        :return True if the sample is written, or False if unchanged.
+        """
+        if ts is None:
+            ts = time.time()
+        values = (user_info.balance, user_info.use_flow, user_info.available_flow)
+        with self.__lock:
+            if self.__latest.get(user_info.account) == values:
+                return False
+            with self.__conn:
+                self.__conn.execute('INSERT OR REPLACE INTO flow VALUES (?, ?, ?, ?, ?)',
+                                    (user_info.account, int(ts)) + values)
+            self.__latest[user_info.account] = values
+        return True
+
+    def poll(self) -> int:
+        """Poll all the accounts once.
+
+        The exceptions of the failed accounts are available through
+        FlowCollector.get_errors.
+
+        :return The number of written samples.
+        """
+        errors = {}
+        written = 0
+        for account, result in loadUserInfoBulk(self.__accounts, self.__max_workers,
+                                                self.__rate_limit, webvpn=self.__webvpn,
+                                                **self.__kwargs):
+            if isinstance(result, Exception):
+                errors[account] = result
+            elif result is not None:
+                written += int(self.add(result))
+        self.__errors = errors
+        return written
+
+    def run(self, interval: float, iterations: Optional[Union[None, int]] = None):
+        """Poll all the accounts every interval seconds until FlowCollector.stop
+        is called.
+
+        :param interval: The interval in seconds between the starts of two polls.
+        :param iterations: The max number of polls, no limit if None.
+        """
+        self.__stop_event.clear()
+        next_time = time.monotonic()
+        count = 0
+        while not self.__stop_event.is_set():
+            self.poll()
+            count += 1
+            if iterations is not None and count >= iterations:
+                break
+            next_time += interval
+            self.__stop_event.wait(max(0, next_time - time.monotonic()))
+
+    def stop(self):
+        """Stop FlowCollector.run."""
+        self.__stop_event.set()
+
+    def close(self):
+        """Close the database."""
+        with self.__lock:
+            self.__conn.close()
+
+    def query(self, account: Union[str, int],
+              start: Optional[Union[None, int]] = None,
+              end: Optional[Union[None, int]] = None) -> List[FlowSample]:
+        """Get the samples of an account in a time range.
+
+        :param account: The account.
+        :param start: Only the samples at or after it, no limit if None.
+        :param end: Only the samples before it, no limit if None.
+        :return A list of FlowSample in time order.
+        """
+        sql = 'SELECT ts, balance, use_flow, available_flow FROM flow WHERE account = ?'
+        params = [str(account)]
+        if start is not None:
+            sql += ' AND ts >= ?'
+            params.append(int(start))
+        if end is not None:
+            sql += ' AND ts < ?'
+            params.append(int(end))
+        with self.__lock:
+            rows = self.__conn.execute(sql + ' ORDER BY ts', params).fetchall()
+        return [FlowSample(*row) for row in rows]
+
+    def value_at(self, account: Union[str, int], ts: int) -> Optional[FlowSample]:
+        """Get the latest sample of an account at or before a time.
+
+        :param account: The account.
+        :param ts: The time.
+        :return A FlowSample, or None if there is no sample before ts.
+        """
+        with self.__lock:
+            row = self.__conn.execute('SELECT ts, balance, use_flow, available_flow FROM flow '
+                                      'WHERE account = ? AND ts <= ? ORDER BY ts DESC LIMIT 1',
+                                      (str(account), int(ts))).fetchone()
+        return None if row is None else FlowSample(*row)
+
+    def deltas(self, account: Union[str, int], interval: int,
+               start: int, end: int) -> List[FlowDelta]:
+        """Get the changes of the values of an account per interval.
+
+        The value at a time is the one of the latest sample at or before
+        it. The intervals before the first sample of the account are
+        skipped.
+
+        :param account: The account.
+        :param interval: The length of an interval in seconds.
+        :param start: The start of the first interval.
+        :param end: The end of the time range, the last interval is
+            truncated at it.
+        :return A list of FlowDelta, whose values are the value at the end
+            of the interval minus the value at the start, e.g. a positive
+            use_flow is the flow used in the interval.
+        """
+        if interval <= 0:
+            raise ValueError('interval must be positive')
+        first = self.value_at(account, start)
+        samples = ([first] if first is not None else []) + self.query(account, start + 1, end + 1)
+        times = [sample.ts for sample in samples]
+
+        def value(ts):
+            index = bisect.bisect_right(times, ts) - 1
+            return samples[index] if index >= 0 else None
+
+        deltas = []
+        for left in range(int(start), int(end), int(interval)):
+            right = min(left + interval, end)
+            before, after = value(left), value(right)
+            if before is None or after is None:
+                continue
+            deltas.append(FlowDelta(left, right,
+                                    after.balance - before.balance,
+                                    after.use_flow - before.use_flow,
+                                    after.available_flow - before.available_flow))
+        return deltas
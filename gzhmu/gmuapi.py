@@ -74,13 +74,55 @@ an object of WebVPN, for example:
         used flow: xxx MB
         >>> print('available flow:', userInfo.available_flow, 'MB')
         available flow: xxx MB
+
+Without web VPN, the APIs are requested with a module level 
+requests.Session, so that the connections to the eportal are pooled 
+and kept alive across calls and threads. Replace it to tune the pool:
+
+        >>> from gzhmu import create_api_session, set_api_session
+        >>> set_api_session(create_api_session(pool_size=32))
+
+or pass a session to a single call, e.g. loadUserInfo(account, session=session).
+
+To serve dashboards which query the same accounts over and over, use the 
+cached variants, which share a TTLCache keyed by the function, the 
+account and whether web VPN is used:
+
+        >>> from gzhmu import cachedLoadUserInfo, set_api_cache, TTLCache
+        >>> set_api_cache(TTLCache(ttl=60, maxsize=4096, stale_ttl=300))
+        >>> userInfo = cachedLoadUserInfo('xxxxxxxxxx')
+
+To query many accounts, use the bulk variants, which run the queries 
+concurrently and yield the results as they complete:
+
+        >>> from gzhmu import loadUserInfoBulk
+        >>> accounts = ['xxxxxxxxxx', 'yyyyyyyyyy']
+        >>> for account, result in loadUserInfoBulk(accounts, max_workers=8, rate_limit=50):
+        ...     if isinstance(result, Exception):
+        ...         print(account, 'failed:', repr(result))
+        ...     else:
+        ...         print(account, result.available_flow, 'MB')
+        ... 
 """
 
+import re
 import time
 import json
-from typing import List, Union, Optional
+import datetime
+import threading
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Union, Optional, Iterable, Iterator, Tuple, Callable, Any
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import TTLCache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 default_user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/105.0.5746.284 Safari/537.36'
@@ -143,6 +185,33 @@ class Device:
                           repr(self.mac), self.login_time)
 
 
+class RateLimiter:
+    """A thread-safe limiter which spaces out the calls evenly.
+
+    :param rate: The max number of calls per second.
+    """
+
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.__interval = 1 / float(rate)
+        self.__next_time = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def get_rate(self) -> float:
+        """Get the max number of calls per second."""
+        return 1 / self.__interval
+
+    def acquire(self):
+        """Block until the next call is allowed."""
+        with self.__lock:
+            now = time.monotonic()
+            scheduled = max(self.__next_time, now)
+            self.__next_time = scheduled + self.__interval
+        if scheduled > now:
+            time.sleep(scheduled - now)
+
+
 def balance_cvt(balance: str) -> float:
     """Convert balance in format like "0 Yuan" to float"""
     return float(balance.split()[0])
@@ -160,24 +229,157 @@ def flow_cvt(flow: str) -> float:
         return float(flow[:-2]) * 1073741824
 
 
-def request_api(url, webvpn=None, **kwargs) -> dict:
+def mac_cvt(mac: str) -> str:
+    """Convert MAC address in format like "2c:54:91:88:c9:e3" or 
+    "2C-54-91-88-C9-E3" to 12 digits in upper case"""
+    return mac.replace(':', '').replace('-', '').upper()
+
+
+def create_api_session(pool_size: Optional[int] = 10, 
+                       keep_alive: Optional[bool] = True, 
+                       max_retries: Optional[int] = 0) -> requests.Session:
+    """Create a session with a connection pool for the eportal APIs.
+
+    The connection pool of a session is thread-safe, so a session 
+    can be shared among threads.
+
+    :param pool_size: The max number of connections kept alive per host, 
+        which should be no less than the number of threads sharing the session.
+    :param keep_alive: Whether to keep the connections alive, False to 
+        close the connection after every request.
+    :param max_retries: The max number of retries of a failed connection.
+    :return A requests.Session object.
+    """
+    session = requests.Session()
+    # A pool is kept per host and port, e.g. the eportal APIs on port 801 
+    # and its status page on port 80, so keep the default number of pools.
+    adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=max_retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = default_user_agent
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+_api_session = None
+_api_session_lock = threading.Lock()
+
+
+def get_api_session() -> requests.Session:
+    """Get the module level session for the eportal APIs, which is 
+    created by create_api_session with the default arguments if not set.
+
+    :return A requests.Session object.
+    """
+    global _api_session
+    if _api_session is None:
+        with _api_session_lock:
+            if _api_session is None:
+                _api_session = create_api_session()
+    return _api_session
+
+
+def set_api_session(session: requests.Session):
+    """Set the module level session for the eportal APIs.
+
+    :param session: A requests.Session object, e.g. created by 
+        create_api_session, or None to create a default one on demand.
+    """
+    global _api_session
+    with _api_session_lock:
+        _api_session = session
+
+
+_api_cache = None
+_api_cache_lock = threading.Lock()
+
+
+def get_api_cache() -> TTLCache:
+    """Get the module level cache of cachedLoadUserInfo and 
+    cachedLoadOnlineDevices, which is a TTLCache with a TTL of 60 
+    seconds and serves stale entries for 180 seconds if not set.
+    The errors of the background reloads are counted in its get_info.
+
+    :return A gzhmu.cache.TTLCache object.
+    """
+    global _api_cache
+    if _api_cache is None:
+        with _api_cache_lock:
+            if _api_cache is None:
+                _api_cache = TTLCache(ttl=60, maxsize=1024, stale_ttl=180)
+    return _api_cache
+
+
+def set_api_cache(cache: TTLCache):
+    """Set the module level cache of cachedLoadUserInfo and cachedLoadOnlineDevices.
+
+    :param cache: A gzhmu.cache.TTLCache object, or None to create a 
+        default one on demand.
+    """
+    global _api_cache
+    with _api_cache_lock:
+        _api_cache = cache
+
+
+def request_api(url, webvpn=None, session=None, **kwargs) -> dict:
+    """Request an eportal API and parse the JSONP response.
+
+    :param url: The URL of the API.
+    :param webvpn: An object of gzhmu.Gzhmu class to request via web VPN.
+    :param session: The requests.Session to request without web VPN, 
+        default to the one of get_api_session.
+    :param kwargs: Arguments for requests.request method.
+    :return The JSON object in the response.
+    """
     if kwargs.get('headers') is None:
         kwargs['headers'] = {'User-Agent': default_user_agent}
 
     if webvpn is None:
-        response = requests.get(url, **kwargs)
+        if session is None:
+            session = get_api_session()
+        response = session.get(url, **kwargs)
     else:
         response = webvpn.get(url, **kwargs)
     if response.status_code < 200 or response.status_code >= 300:
         raise RequestException(response.status_code)
 
-    text = response.content.decode('utf-8')
-    if webvpn is not None:
-        text = text[text.find('{')+1:text.rfind('}')]
-    text = text.strip()[12:-2]
+    return parse_jsonp(response.content, webvpn is not None)
+
+
+# The callback of JSONP and the left parenthesis, e.g. `jsonpReturn(`.
+_jsonp_callback_pattern = re.compile(rb'\s*[A-Za-z_$][\w$.]*\s*\(')
+
+
+def parse_jsonp(content: bytes, webvpn: Optional[bool] = False) -> dict:
+    """Parse the JSON object in a JSONP response, e.g. `jsonpReturn({...});`.
 
-    response_json = json.loads(text)
-    return response_json
+    The payload between the `(` after the callback and the last `)` 
+    is parsed in place, so the callback can be of any name. A response 
+    without callback is parsed as plain JSON. orjson is used if installed, 
+    which parses the payload without copying it.
+
+    :param content: The response body in bytes.
+    :param webvpn: Whether the response is fetched via web VPN, which 
+        wraps the JSONP in braces, so only the text between the first 
+        `{` and the last `}` is searched.
+    :return The JSON object.
+    """
+    start = 0
+    end = len(content)
+    if webvpn:
+        start = content.find(b'{') + 1
+        end = content.rfind(b'}')
+    match = _jsonp_callback_pattern.match(content, start, end)
+    if match is None:
+        if webvpn:
+            start, end = start - 1, end + 1
+    else:
+        start = match.end()
+        end = content.rfind(b')', start, end)
+    if orjson is not None:
+        return orjson.loads(memoryview(content)[start:end])
+    return json.loads(content[start:end])
  
 
 def login(account: Union[str, int], password: str, webvpn=None, **kwargs) -> bool:
@@ -187,7 +389,7 @@ def login(account: Union[str, int], password: str, webvpn=None, **kwargs) -> boo
     :param password: The password.
     :param webvpn: An object of gzhmu.Gzhmu class. With this argument set, you 
         can query this API via web VPN. But you have to log in the protal first.
-    :param kwargs: Arguments for requests.request method.
+    :param kwargs: Arguments for request_api, e.g. session, and requests.request method.
     :return True if succeed or False if fail.
     """
     url = 'http://192.168.12.3:801/eportal/portal/login?lang=en&user_account=,0,%s&user_password=%s'
@@ -213,7 +415,7 @@ def loadUserInfo(account: Union[str, int], webvpn=None, **kwargs) -> UserInfo:
     :param account: The account.
     :param webvpn: An object of gzhmu.Gzhmu class. With this argument set, you 
         can query this API via web VPN. But you have to log in the protal first.
-    :param kwargs: Arguments for requests.request method.
+    :param kwargs: Arguments for request_api, e.g. session, and requests.request method.
     :return An object of UserInfo.
     """
     url = 'http://192.168.12.3:801/eportal/portal/page/loadUserInfo?lang=en&program_index=1&page_index=voRYWy1627029238&wlan_user_ip=&wlan_user_mac=&jsVersion=&user_account=%s'
@@ -243,7 +445,7 @@ def loadOnlineDevices(account: Union[str, int], webvpn=None, **kwargs) -> List[D
     :param account: The account.
     :param webvpn: An object of gzhmu.Gzhmu class. With this argument set, you 
         can query this API via web VPN. But you have to log in the protal first.
-    :param kwargs: Arguments for requests.request method.
+    :param kwargs: Arguments for request_api, e.g. session, and requests.request method.
     :return A list of objects of Device.
     """
     url = 'http://192.168.12.3:801/eportal/portal/page/loadOnlineRecord?lang=en&program_index=1&page_index=voRYWy1627029238&wlan_user_ip=&wlan_user_mac=&start_time=0&end_time=0&start_rn=1&end_rn=5&jsVersion=&user_account=%s'
@@ -253,18 +455,82 @@ def loadOnlineDevices(account: Union[str, int], webvpn=None, **kwargs) -> List[D
     code = response_json.get('code')
 
     if code == 1:
-        records = response_json['records']
-        devices = []
-        for record in records:
-            login_time = time.strptime(record['login_time'], r'%Y-%m-%d %H:%M:%S')
-            login_time = time.mktime(login_time)
-            device = Device(record['login_ip'], record['mac_address'], login_time)
-            devices.append(device)
-        return devices
+        return [record_to_device(record) for record in response_json['records']]
 
     if code == 0:
         raise FailedToLoadOnlineDevicesException()
 
+
+def iterOnlineDevices(account: Union[str, int], 
+                      page_size: Optional[int] = 20, 
+                      start_time: Optional[Union[int, str, datetime.datetime]] = 0, 
+                      end_time: Optional[Union[int, str, datetime.datetime]] = 0, 
+                      webvpn=None, **kwargs) -> Iterator[Device]:
+    """Iterate over the online records of the specified account page by page.
+
+    A page is only requested when the devices of the previous page are 
+    consumed, and the iteration stops at the first page shorter than 
+    page_size.
+
+        >>> from gzhmu import iterOnlineDevices
+        >>> from datetime import datetime
+        >>> account = 'xxxxxxxxxx'
+        >>> for device in iterOnlineDevices(account, start_time=datetime(2023, 1, 1)):
+        ...     print(device.login_ip, device.mac, time.ctime(device.login_time), sep='\t')
+        ... 
+
+    :param account: The account.
+    :param page_size: The number of records per request.
+    :param start_time: Only the records logged in after it, 0 for no limit. 
+        A datetime is formatted as `%Y-%m-%d %H:%M:%S`.
+    :param end_time: Only the records logged in before it, 0 for no limit.
+    :param webvpn: An object of gzhmu.Gzhmu class. With this argument set, you 
+        can query this API via web VPN. But you have to log in the protal first.
+    :param kwargs: Arguments for request_api, e.g. session, and requests.request method.
+    :return An iterator of objects of Device. FailedToLoadOnlineDevicesException 
+        is raised if any page fails, so the records are never truncated 
+        silently.
+    """
+    if page_size < 1:
+        raise ValueError('page_size must be positive')
+    if isinstance(start_time, datetime.datetime):
+        start_time = start_time.strftime(r'%Y-%m-%d %H:%M:%S')
+    if isinstance(end_time, datetime.datetime):
+        end_time = end_time.strftime(r'%Y-%m-%d %H:%M:%S')
+
+    url = 'http://192.168.12.3:801/eportal/portal/page/loadOnlineRecord?'
+    query = {
+        'lang': 'en',
+        'program_index': 1,
+        'page_index': 'voRYWy1627029238',
+        'wlan_user_ip': '',
+        'wlan_user_mac': '',
+        'start_time': start_time,
+        'end_time': end_time,
+        'start_rn': 1,
+        'end_rn': page_size,
+        'jsVersion': '',
+        'user_account': account,
+    }
+    while True:
+        response_json = request_api(url + urlencode(query), webvpn=webvpn, **kwargs)
+        if response_json.get('code') != 1:
+            raise FailedToLoadOnlineDevicesException()
+        records = response_json.get('records') or []
+        for record in records:
+            yield record_to_device(record)
+        if len(records) < page_size:
+            return
+        query['start_rn'] += page_size
+        query['end_rn'] += page_size
+
+
+def record_to_device(record: dict) -> Device:
+    """Convert an online record of the eportal API to a Device object."""
+    login_time = time.strptime(record['login_time'], r'%Y-%m-%d %H:%M:%S')
+    login_time = time.mktime(login_time)
+    return Device(record['login_ip'], record['mac_address'], login_time)
+
      
 def unbind(account: Union[str, int], mac: str, webvpn=None, **kwargs) -> bool:
     """Unbind an online device of the specified account and MAC address.
@@ -273,7 +539,7 @@ def unbind(account: Union[str, int], mac: str, webvpn=None, **kwargs) -> bool:
     :param mac: A 12 digits hexadecimal number, e.g. 2c549188c9e3.
     :param webvpn: An object of gzhmu.Gzhmu class. With this argument set, you 
         can query this API via web VPN. But you have to log in the protal first.
-    :param kwargs: Arguments for requests.request method.
+    :param kwargs: Arguments for request_api, e.g. session, and requests.request method.
     :return The result whether the unbind is successful.
     """
     url = 'http://192.168.12.3:801/eportal/portal/mac/unbind?user_account=%s&wlan_user_mac=%s'
@@ -285,12 +551,58 @@ def unbind(account: Union[str, int], mac: str, webvpn=None, **kwargs) -> bool:
     return result == 1
 
 
+def unbindAll(account: Union[str, int], keep: Optional[Iterable[str]] = (), 
+              max_workers: Optional[int] = 8, webvpn=None, 
+              **kwargs) -> Dict[str, Union[bool, Exception]]:
+    """Unbind all the online devices of the specified account except the kept ones.
+
+    The devices are listed with iterOnlineDevices, and unbound 
+    concurrently over the shared session.
+
+        >>> from gzhmu import unbindAll
+        >>> account = 'xxxxxxxxxx'
+        >>> results = unbindAll(account, keep=['2c:54:91:88:c9:e3'])
+        >>> failed = [mac for mac, result in results.items() if result is not True]
+
+    :param account: The account.
+    :param keep: The MAC addresses not to unbind, in any case and 
+        with or without `:` or `-`.
+    :param max_workers: The max number of concurrent unbinds.
+    :param webvpn: An object of gzhmu.Gzhmu class. With this argument set, you 
+        can query this API via web VPN. But you have to log in the protal first.
+    :param kwargs: Arguments for request_api, e.g. session, and requests.request method.
+    :return A dict of the unbound MAC addresses in 12 digits in upper case 
+        and the results, which are the results of unbind or the exceptions 
+        raised. The exception of iterOnlineDevices is raised before any 
+        device is unbound.
+    """
+    keep = {mac_cvt(mac) for mac in keep}
+    macs = []
+    for device in iterOnlineDevices(account, webvpn=webvpn, **kwargs):
+        mac = mac_cvt(device.mac)
+        if mac not in keep and mac not in macs:
+            macs.append(mac)
+
+    results = {}
+    if not macs:
+        return results
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(macs))) as executor:
+        futures = {executor.submit(unbind, account, mac, webvpn=webvpn, **kwargs): mac 
+                   for mac in macs}
+        for future, mac in futures.items():
+            try:
+                results[mac] = future.result()
+            except Exception as e:
+                results[mac] = e
+    return results
+
+
 def logout(webvpn=None, **kwargs) -> bool:
     """Logout the current device.
 
     :param webvpn: An object of gzhmu.Gzhmu class. With this argument set, you 
         can query this API via web VPN. But you have to log in the protal first.
-    :param kwargs: Arguments for requests.request method.
+    :param kwargs: Arguments for request_api, e.g. session, and requests.request method.
     :return The result whether the logout is successful.
     """
     url = 'http://192.168.12.3:801/eportal/portal/logout'
@@ -299,3 +611,178 @@ def logout(webvpn=None, **kwargs) -> bool:
     result = response_json.get('result')
 
     return result == 1
+
+
+def checkStatus(webvpn=None, **kwargs) -> bool:
+    """Check whether the current device is logged in to campus network.
+
+    The status page of the eportal is requested, which is on campus, 
+    so it tells whether the device is authenticated instead of whether 
+    the internet is reachable.
+
+    :param webvpn: An object of gzhmu.Gzhmu class. With this argument set, you 
+        can query this API via web VPN. But you have to log in the protal first.
+    :param kwargs: Arguments for request_api, e.g. session, and requests.request method.
+    :return True if logged in or False if not.
+    """
+    url = 'http://192.168.12.3/drcom/chkstatus?callback=dr1002&jsVersion=4.X&lang=en'
+
+    response_json = request_api(url, webvpn=webvpn, **kwargs)
+    result = response_json.get('result')
+
+    return result == 1
+
+
+def run_bulk(func: Callable[..., Any], 
+             accounts: Iterable[Union[str, int]], 
+             max_workers: Optional[int] = 8, 
+             rate_limit: Optional[Union[None, float, RateLimiter]] = None, 
+             **kwargs) -> Iterator[Tuple[str, Any]]:
+    """Call a function for every account on a pool of threads.
+
+    At most 2 * max_workers accounts are taken from accounts ahead of 
+    the results, so accounts can be a lazy iterable, and the pending 
+    calls are cancelled if the iterator is closed early.
+
+    :param func: The function to call with an account and kwargs, 
+        e.g. loadUserInfo.
+    :param accounts: The accounts.
+    :param max_workers: The max number of threads. Without web VPN, the 
+        shared session is used, whose pool size should be no less than it.
+    :param rate_limit: The max number of calls per second, or a RateLimiter 
+        shared with other calls. No limit if None.
+    :param kwargs: Arguments for func.
+    :return An iterator of tuples of the account and the result, or the 
+        exception raised by func, in the order of completion.
+    """
+    if rate_limit is not None and not isinstance(rate_limit, RateLimiter):
+        rate_limit = RateLimiter(rate_limit)
+
+    def call(account):
+        if rate_limit is not None:
+            rate_limit.acquire()
+        return func(account, **kwargs)
+
+    accounts = iter(accounts)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {}
+    try:
+        while True:
+            for account in accounts:
+                account = str(account)
+                pending[executor.submit(call, account)] = account
+                if len(pending) >= 2 * max_workers:
+                    break
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                account = pending.pop(future)
+                try:
+                    yield account, future.result()
+                except Exception as e:
+                    yield account, e
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def loadUserInfoBulk(accounts: Iterable[Union[str, int]], 
+                     max_workers: Optional[int] = 8, 
+                     rate_limit: Optional[Union[None, float, RateLimiter]] = None, 
+                     webvpn=None, **kwargs) -> Iterator[Tuple[str, Union[UserInfo, Exception]]]:
+    """Get user information of many accounts concurrently.
+
+    See run_bulk for the details of the arguments.
+
+    :param accounts: The accounts.
+    :param max_workers: The max number of threads.
+    :param rate_limit: The max number of requests per second, or a RateLimiter.
+    :param webvpn: An object of gzhmu.Gzhmu class. With this argument set, you 
+        can query this API via web VPN. But you have to log in the protal first.
+    :param kwargs: Arguments for request_api, e.g. session, and requests.request method.
+    :return An iterator of tuples of the account and an object of UserInfo, 
+        or the exception, e.g. FailedToGetUserInfoException, in the order 
+        of completion.
+    """
+    return run_bulk(loadUserInfo, accounts, max_workers, rate_limit, 
+                    webvpn=webvpn, **kwargs)
+
+
+def loadOnlineDevicesBulk(accounts: Iterable[Union[str, int]], 
+                          max_workers: Optional[int] = 8, 
+                          rate_limit: Optional[Union[None, float, RateLimiter]] = None, 
+                          webvpn=None, **kwargs) -> Iterator[Tuple[str, Union[List[Device], Exception]]]:
+    """Get online devices of many accounts concurrently.
+
+    See run_bulk for the details of the arguments.
+
+    :param accounts: The accounts.
+    :param max_workers: The max number of threads.
+    :param rate_limit: The max number of requests per second, or a RateLimiter.
+    :param webvpn: An object of gzhmu.Gzhmu class. With this argument set, you 
+        can query this API via web VPN. But you have to log in the protal first.
+    :param kwargs: Arguments for request_api, e.g. session, and requests.request method.
+    :return An iterator of tuples of the account and a list of objects of 
+        Device, or the exception, e.g. FailedToLoadOnlineDevicesException, 
+        in the order of completion.
+    """
+    return run_bulk(loadOnlineDevices, accounts, max_workers, rate_limit, 
+                    webvpn=webvpn, **kwargs)
+
+
+def cached_call(func: Callable[..., Any], account: Union[str, int], 
+                webvpn=None, cache: Optional[Union[None, TTLCache]] = None, 
+                **kwargs) -> Any:
+    """Call func(account, webvpn=webvpn, **kwargs) through a TTLCache.
+
+    The key is the name of func, the account and whether web VPN is 
+    used, kwargs are not a part of the key.
+
+    :param func: The function to call, e.g. loadUserInfo.
+    :param account: The account.
+    :param webvpn: An object of gzhmu.Gzhmu class to query via web VPN.
+    :param cache: The cache, default to the one of get_api_cache.
+    :param kwargs: Arguments for func.
+    :return The cached, stale or new result of func.
+    """
+    if cache is None:
+        cache = get_api_cache()
+    account = str(account)
+    key = (func.__name__, account, 'direct' if webvpn is None else 'webvpn')
+    return cache.get_or_load(key, lambda: func(account, webvpn=webvpn, **kwargs))
+
+
+def cachedLoadUserInfo(account: Union[str, int], webvpn=None, 
+                       cache: Optional[Union[None, TTLCache]] = None, 
+                       **kwargs) -> UserInfo:
+    """Get user information of the specified account through a cache.
+
+    The result is shared by the callers, don't modify it.
+
+    :param account: The account.
+    :param webvpn: An object of gzhmu.Gzhmu class. With this argument set, you 
+        can query this API via web VPN. But you have to log in the protal first.
+    :param cache: A gzhmu.cache.TTLCache, default to the one of get_api_cache.
+    :param kwargs: Arguments for request_api, e.g. session, and requests.request method.
+    :return An object of UserInfo.
+    """
+    return cached_call(loadUserInfo, account, webvpn, cache, **kwargs)
+
+
+def cachedLoadOnlineDevices(account: Union[str, int], webvpn=None, 
+                            cache: Optional[Union[None, TTLCache]] = None, 
+                            **kwargs) -> List[Device]:
+    """Get online devices of the specified account through a cache.
+
+    The result is shared by the callers, don't modify it.
+
+    :param account: The account.
+    :param webvpn: An object of gzhmu.Gzhmu class. With this argument set, you 
+        can query this API via web VPN. But you have to log in the protal first.
+    :param cache: A gzhmu.cache.TTLCache, default to the one of get_api_cache.
+    :param kwargs: Arguments for request_api, e.g. session, and requests.request method.
+    :return A list of objects of Device.
+    """
+    return cached_call(loadOnlineDevices, account, webvpn, cache, **kwargs)
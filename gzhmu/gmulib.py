@@ -1,9 +1,15 @@
+import os
 import re
+import json
+import time
 import datetime
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, urlencode, quote, unquote
 from typing import Optional, Union, List
 
 from .gzhmu import Gzhmu
+from .store import SessionStore
 
 
 class TargetLibraryNotFoundException(Exception):
@@ -89,13 +95,19 @@ class Room:
         self.room_id = room_id
         self.room_name = room_name
         self.seats = seats
+        # Seat number -> the first Seat with it, built on demand.
+        self.__seats_by_number = None
     
     def get_seat_with_number(self, no: int) -> Seat:
-        no = int(no)
-        for seat in self.seats:
-            if seat.seat_number == no:
-                return seat
-        raise TargetSeatNotFoundException()
+        if self.__seats_by_number is None:
+            seats_by_number = {}
+            for seat in self.seats:
+                seats_by_number.setdefault(seat.seat_number, seat)
+            self.__seats_by_number = seats_by_number
+        try:
+            return self.__seats_by_number[int(no)]
+        except KeyError:
+            raise TargetSeatNotFoundException()
 
     def __repr__(self):
         return f'{__name__}.{Room.__name__}(room_id = {self.room_id}, room_name = {repr(self.room_name)})'
@@ -472,6 +484,16 @@ class GmuLib(Gzhmu):
     :param proxies: Use a proxy for every individual requests.
         See `https://docs.python-requests.org/en/latest/user/advanced/#proxies` in detail.
     :param timeout: Timeout for every individual requests.
+    :param session_store: A gzhmu.store.SessionStore object to save 
+        and resume the session. See gzhmu.Gzhmu for more details.
+    :param catalog_path: The path of a JSON file to cache the libraries, 
+        rooms and seats on disk, so that GmuLib.get_libraries of a new 
+        instance doesn't fetch the seats of every room again. No cache 
+        if None.
+    :param catalog_max_age: The max seconds to use the cached catalog for.
+    :param catalog_validate: Whether to validate the cached catalog by 
+        comparing the room list on Default.aspx with the cached one, 
+        which takes a request.
     """
 
     LIBRARY_ID_PANYU = 100492446
@@ -479,14 +501,26 @@ class GmuLib(Gzhmu):
     LIBRARY_ID_YUEXIU = 100492751
     LIBRARY_NAME_YUEXIU = '越秀校区图书馆'
 
+    # Version of the format of the catalog file.
+    CATALOG_VERSION = 1
+
     def __init__(self, 
             username: Optional[Union[None, str, int]] = None, 
             password: Optional[Union[None, str]] = None, 
             webvpn: Optional[bool] = False, 
             proxies: Optional[Union[None, dict]] = None, 
-            timeout: Optional[Union[int ,float]] = 10):
-        super().__init__(username, password, webvpn, proxies, timeout)
+            timeout: Optional[Union[int ,float]] = 10, 
+            session_store: Optional[Union[None, SessionStore]] = None, 
+            catalog_path: Optional[Union[None, str]] = None, 
+            catalog_max_age: Optional[float] = 7 * 86400, 
+            catalog_validate: Optional[bool] = True):
+        super().__init__(username, password, webvpn, proxies, 
+                         timeout=timeout, session_store=session_store)
+        self.__catalog_path = catalog_path
+        self.__catalog_max_age = catalog_max_age
+        self.__catalog_validate = bool(catalog_validate)
         self.__libraries = None
+        self.__indexes = None
         self.__user_info = None
 
     @staticmethod
@@ -498,83 +532,221 @@ class GmuLib(Gzhmu):
         """
         return f'http://update.unifound.net/wxnotice/s.aspx?c={seat.lib_id}_Seat_{seat.seat_id}_1EQ'
 
-    def login(self):
+    def login(self, **kwargs):
         """Login library website.
 
+        :param kwargs: Arguments for Gzhmu.login method except service.
         :return Always True if log in successfully.
         """
         url = 'http://ggyy.gzhmu.edu.cn'
-        res = super().login(service=url)
+        res = super().login(service=url, **kwargs)
         return res
 
-    def get_libraries(self) -> List[Library]:
+    def get_libraries(self, max_workers: Optional[int] = 8) -> List[Library]:
         """Get a list of objects of class Library.
 
+        The seats of the rooms are fetched concurrently over the 
+        logged in session.
+
+        If catalog_path is set, the catalog is loaded from it while 
+        valid, or saved to it after fetched.
+
+        :param max_workers: The max number of rooms to fetch at the 
+            same time, 1 to fetch one by one.
         :return A list of Library objects.
         """
         if self.__libraries is not None:
             return self.__libraries
+        if self.__catalog_path is not None and not self.__catalog_validate:
+            libraries = self.__load_catalog()
+            if libraries is not None:
+                self.__set_libraries(libraries)
+                return self.__libraries
         home_url = 'https://ggyy.gzhmu.edu.cn/clientweb/xcus/ic2/Default.aspx'
         response = self.get(home_url)
         if urlparse(response.url).hostname == 'sso.gzhmu.edu.cn':
             raise NotLoggedInOrLoginExpiredException()
         room_info = re.findall(r'lab_(\d+).+?roomId=(\d+)&roomName=([^"]+)"', 
                                response.text)
-        panyu_lib_rooms = []
-        yuexiu_lib_rooms = []
-        for lib_id, room_id, room_name in room_info:
-            query_params = {
-                'byType': 'devcls',
-                'classkind': 8,
-                'display': 'fp',
-                'md': 'd',
-                'room_id': room_id,
-                'purpose': '',
-                'selectOpenAty': '',
-                'cld_name': 'default',
-                'act': 'get_dev_coord',
-            }
-            url = 'https://ggyy.gzhmu.edu.cn/ClientWeb/pro/ajax/device.aspx?'\
-                  + urlencode(query_params)
-            response = self.get(url)
-            seats = []
-            resp_json = response.json()
-            ret_code = resp_json['ret']
-            if ret_code == 1:
-                pass
-            elif ret_code == -1:
-                raise NotLoggedInOrLoginExpiredException()
-            else:
-                raise Exception(resp_json['msg'])
+        if self.__catalog_path is not None:
+            libraries = self.__load_catalog(room_info)
+            if libraries is not None:
+                self.__set_libraries(libraries)
+                return self.__libraries
+
+        if max_workers > 1 and len(room_info) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(room_info))) as executor:
+                rooms = list(executor.map(lambda info: self.__get_room(*info), room_info))
+        else:
+            rooms = [self.__get_room(*info) for info in room_info]
+        self.__set_libraries(GmuLib.__build_libraries(rooms))
+        if self.__catalog_path is not None:
+            self.__save_catalog(room_info, rooms)
+        return self.__libraries
 
-            lib_id = int(lib_id)
-            room_id = int(room_id)
-            room_name = unquote(room_name)
+    def __set_libraries(self, libraries: List[Library]):
+        """Set the catalog and build the indexes of the IDs and names.
 
-            if lib_id == GmuLib.LIBRARY_ID_PANYU:
-                lib_name = GmuLib.LIBRARY_NAME_PANYU
-            else:
-                lib_name = GmuLib.LIBRARY_NAME_YUEXIU
+        An ID maps to the first library, room or seat with it, and an 
+        exact name maps to all the libraries, rooms or seats with it.
+        """
+        libraries_by_id = {}
+        libraries_by_name = {}
+        rooms_by_id = {}
+        rooms_by_name = {}
+        seats_by_id = {}
+        seats_by_name = {}
+        for library in libraries:
+            libraries_by_id.setdefault(library.lib_id, library)
+            libraries_by_name.setdefault(library.lib_name, []).append(library)
+            for room in library.rooms:
+                rooms_by_id.setdefault(room.room_id, room)
+                rooms_by_name.setdefault(room.room_name, []).append(room)
+                for seat in room.seats:
+                    seats_by_id.setdefault(seat.seat_id, seat)
+                    seats_by_name.setdefault(seat.seat_name, []).append(seat)
+        self.__indexes = {
+            'libraries_by_id': libraries_by_id,
+            'libraries_by_name': libraries_by_name,
+            'rooms_by_id': rooms_by_id,
+            'seats_by_id': seats_by_id,
+            'rooms_by_name': rooms_by_name,
+            'seats_by_name': seats_by_name,
+        }
+        self.__libraries = libraries
 
-            for seat_json in response.json()['data']['objs']:
-                seat_id = int(seat_json['id'])
-                seat_name = seat_json['name']
-                seat = Seat(lib_id, lib_name, room_id, room_name, seat_id, seat_name)
-                seats.append(seat)
+    def __get_index(self, name: str) -> dict:
+        """Get an index, loading the catalog if not yet."""
+        if self.__indexes is None:
+            self.get_libraries()
+        return self.__indexes[name]
 
-            room = Room(lib_id, lib_name, room_id, room_name, seats)
-            if lib_id == GmuLib.LIBRARY_ID_PANYU:
+    @staticmethod
+    def __build_libraries(rooms: List[Room]) -> List[Library]:
+        """Group the rooms into the Panyu and Yuexiu libraries."""
+        panyu_lib_rooms = []
+        yuexiu_lib_rooms = []
+        for room in rooms:
+            if room.lib_id == GmuLib.LIBRARY_ID_PANYU:
                 panyu_lib_rooms.append(room)
-            elif lib_id == GmuLib.LIBRARY_ID_YUEXIU:
+            elif room.lib_id == GmuLib.LIBRARY_ID_YUEXIU:
                 yuexiu_lib_rooms.append(room)
 
         panyu_library = Library(GmuLib.LIBRARY_ID_PANYU, GmuLib.LIBRARY_NAME_PANYU, 
                                 panyu_lib_rooms)
         yuexiu_library = Library(GmuLib.LIBRARY_ID_YUEXIU, GmuLib.LIBRARY_NAME_YUEXIU, 
                                  yuexiu_lib_rooms)
-        self.__libraries = (panyu_library, yuexiu_library)
-        
-        return self.__libraries
+        return (panyu_library, yuexiu_library)
+
+    def __load_catalog(self, room_info: Optional[List[tuple]] = None) -> Optional[List[Library]]:
+        """Load the catalog from catalog_path.
+
+        :param room_info: The room list on Default.aspx to validate the 
+            catalog with, or None not to validate.
+        :return A list of Library objects, or None if the catalog doesn't 
+            exist, is in another version, expired or invalid.
+        """
+        try:
+            with open(self.__catalog_path, 'r', encoding='utf-8') as fp:
+                catalog = json.load(fp)
+            if catalog.get('version') != GmuLib.CATALOG_VERSION:
+                return None
+            if self.__catalog_max_age is not None and \
+                    time.time() - catalog['saved_at'] > self.__catalog_max_age:
+                return None
+            if room_info is not None and \
+                    [tuple(info) for info in catalog['room_info']] != list(room_info):
+                return None
+            rooms = []
+            for room_json in catalog['rooms']:
+                lib_id = room_json['lib_id']
+                lib_name = room_json['lib_name']
+                room_id = room_json['room_id']
+                room_name = room_json['room_name']
+                seats = [Seat(lib_id, lib_name, room_id, room_name, seat_id, seat_name) 
+                         for seat_id, seat_name in room_json['seats']]
+                rooms.append(Room(lib_id, lib_name, room_id, room_name, seats))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return GmuLib.__build_libraries(rooms)
+
+    def __save_catalog(self, room_info: List[tuple], rooms: List[Room]):
+        """Save the catalog to catalog_path atomically.
+
+        :param room_info: The room list on Default.aspx.
+        :param rooms: The fetched Room objects.
+        """
+        catalog = {
+            'version': GmuLib.CATALOG_VERSION,
+            'saved_at': time.time(),
+            'room_info': room_info,
+            'rooms': [{
+                'lib_id': room.lib_id,
+                'lib_name': room.lib_name,
+                'room_id': room.room_id,
+                'room_name': room.room_name,
+                'seats': [[seat.seat_id, seat.seat_name] for seat in room.seats],
+            } for room in rooms],
+        }
+        directory = os.path.dirname(os.path.abspath(self.__catalog_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                json.dump(catalog, fp, ensure_ascii=False)
+            os.replace(temp_path, self.__catalog_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def __get_room(self, lib_id: str, room_id: str, room_name: str) -> Room:
+        """Fetch the seats of a room.
+
+        :param lib_id: The library ID in Default.aspx.
+        :param room_id: The room ID in Default.aspx.
+        :param room_name: The quoted room name in Default.aspx.
+        :return A Room object.
+        """
+        query_params = {
+            'byType': 'devcls',
+            'classkind': 8,
+            'display': 'fp',
+            'md': 'd',
+            'room_id': room_id,
+            'purpose': '',
+            'selectOpenAty': '',
+            'cld_name': 'default',
+            'act': 'get_dev_coord',
+        }
+        url = 'https://ggyy.gzhmu.edu.cn/ClientWeb/pro/ajax/device.aspx?'\
+              + urlencode(query_params)
+        response = self.get(url)
+        seats = []
+        resp_json = response.json()
+        ret_code = resp_json['ret']
+        if ret_code == 1:
+            pass
+        elif ret_code == -1:
+            raise NotLoggedInOrLoginExpiredException()
+        else:
+            raise Exception(resp_json['msg'])
+
+        lib_id = int(lib_id)
+        room_id = int(room_id)
+        room_name = unquote(room_name)
+
+        if lib_id == GmuLib.LIBRARY_ID_PANYU:
+            lib_name = GmuLib.LIBRARY_NAME_PANYU
+        else:
+            lib_name = GmuLib.LIBRARY_NAME_YUEXIU
+
+        for seat_json in resp_json['data']['objs']:
+            seat_id = int(seat_json['id'])
+            seat_name = seat_json['name']
+            seat = Seat(lib_id, lib_name, room_id, room_name, seat_id, seat_name)
+            seats.append(seat)
+
+        return Room(lib_id, lib_name, room_id, room_name, seats)
 
     def get_library_with_id(self, lib_id: int) -> Library:
         """Get a Library with library ID.
@@ -582,11 +754,10 @@ class GmuLib(Gzhmu):
         :param lib_id: The library ID.
         :return A Library object.
         """
-        lib_id = int(lib_id)
-        for library in self.get_libraries():
-            if library.lib_id == lib_id:
-                return library
-        raise TargetLibraryNotFoundException()
+        try:
+            return self.__get_index('libraries_by_id')[int(lib_id)]
+        except KeyError:
+            raise TargetLibraryNotFoundException()
 
     def get_library_with_name(self, lib_name: str) -> List[Library]:
         """Get a list of Librarys with library name.
@@ -595,11 +766,7 @@ class GmuLib(Gzhmu):
         :return A list of Library objects whose names match 
             with the specified library name.
         """
-        libraries = []
-        for library in self.get_libraries():
-            if library.lib_name == lib_name:
-                libraries.append(library)
-        return libraries
+        return list(self.__get_index('libraries_by_name').get(lib_name, ()))
 
     def get_room_with_id(self, room_id: int) -> Room:
         """Get a Room with room ID.
@@ -607,12 +774,10 @@ class GmuLib(Gzhmu):
         :param room_id: The room ID.
         :return A Room object.
         """
-        room_id = int(room_id)
-        for library in self.get_libraries():
-            for room in library.rooms:
-                if room.room_id == room_id:
-                    return room
-        raise TargetRoomNotFoundException()
+        try:
+            return self.__get_index('rooms_by_id')[int(room_id)]
+        except KeyError:
+            raise TargetRoomNotFoundException()
 
     def get_room_with_name(self, room_name: str) -> List[Room]:
         """Get a list of Rooms with with room name.
@@ -628,19 +793,24 @@ class GmuLib(Gzhmu):
                     rooms.append(room)
         return rooms
 
+    def get_rooms_with_exact_name(self, room_name: str) -> List[Room]:
+        """Get a list of Rooms whose names equal the room name, from an index.
+
+        :param room_name: The room name.
+        :return A list of Room objects.
+        """
+        return list(self.__get_index('rooms_by_name').get(room_name, ()))
+
     def get_seat_with_id(self, seat_id: int) -> Seat:
         """Get a Seat with seat ID.
 
         :param seat_id: The seat ID.
         :param A Seat object.
         """
-        seat_id = int(seat_id)
-        for library in self.get_libraries():
-            for room in library.rooms:
-                for seat in room.seats:
-                    if seat.seat_id == seat_id:
-                        return seat
-        raise TargetSeatNotFoundException()
+        try:
+            return self.__get_index('seats_by_id')[int(seat_id)]
+        except KeyError:
+            raise TargetSeatNotFoundException()
 
     def get_seat_with_name(self, seat_name: str) -> List[Seat]:
         """Get a list of seats with seat name.
@@ -657,6 +827,14 @@ class GmuLib(Gzhmu):
                         seats.append(seat)
         return seats
 
+    def get_seats_with_exact_name(self, seat_name: str) -> List[Seat]:
+        """Get a list of seats whose names equal the seat name, from an index.
+
+        :param seat_name: A seat name.
+        :return A list of Seat objects.
+        """
+        return list(self.__get_index('seats_by_name').get(seat_name, ()))
+
     def get_seat_with_check_in_url(self, url: str) -> Seat:
         """Get a Seat object from a check in URL.
 
@@ -865,7 +1043,8 @@ class GmuLib(Gzhmu):
             is_checked_in = '已签到' in record_raw_text
             title = re.search(r'<h3>(.*?)</h3>', record_raw_text).group(1)
             seat_name = re.search(r'<a>(.+?)</a>', record_raw_text).group(1)
-            seat = self.get_seat_with_name(seat_name)[0]
+            seat = (self.get_seats_with_exact_name(seat_name) or 
+                    self.get_seat_with_name(seat_name))[0]
             name = re.search(r'</div</div></td><td>(.+?)</td><td>', 
                                  record_raw_text).group(1)
             start = re.search(r"开始:</span> <span class='text-primary'>([\d\- :]+?)</span>", 
@@ -1,15 +1,15 @@
 import re
+import time
 import base64
-from io import BytesIO
-from typing import Union, Optional
-from urllib.parse import urlparse, urlunparse, urlencode, parse_qs
+from typing import Union, Optional, Tuple, Iterable, Iterator
+from urllib.parse import urlparse, urlunparse, urlsplit, urlencode, parse_qs, SplitResult
 
 import requests
-import numpy as np
 from Crypto.Cipher import AES
-from PIL import Image
 
-from .captcha import recognize
+from .cache import LRUCache
+from .captcha import recognize_png
+from .store import SessionStore, dump_cookies, load_cookies
 
 
 class InvalidUsernameException(Exception):
@@ -92,6 +92,66 @@ class Contact:
                                               repr(self.email))
 
 
+class HostCipher:
+    """AES-CFB cipher with 128-bit segments and a fixed key and IV, 
+    which is used by web VPN to encrypt hostnames.
+
+    With a fixed IV, the keystream of the first block is a constant, 
+    which is precomputed, so a hostname up to 16 bytes is encrypted 
+    or decrypted with a plain XOR. The keystream of every later block 
+    is derived from the previous block of ciphertext, so only those 
+    blocks of longer hostnames need AES, with a reused ECB cipher 
+    instead of a new CFB cipher per call.
+
+    :param key: The AES key.
+    :param iv: The fixed IV.
+    """
+
+    block_size = AES.block_size
+
+    def __init__(self, key: bytes, iv: bytes):
+        self.__ecb = AES.new(key, AES.MODE_ECB)
+        self.__keystream = self.__ecb.encrypt(iv)
+
+    @staticmethod
+    def __xor(data: bytes, keystream: bytes) -> bytes:
+        size = len(data)
+        result = int.from_bytes(data, 'big') ^ int.from_bytes(keystream[:size], 'big')
+        return result.to_bytes(size, 'big')
+
+    def encrypt(self, data: bytes) -> bytes:
+        """Encrypt the data.
+
+        :param data: The plaintext.
+        :returns The ciphertext.
+        """
+        size = HostCipher.block_size
+        if len(data) <= size:
+            return HostCipher.__xor(data, self.__keystream)
+        blocks = []
+        keystream = self.__keystream
+        for i in range(0, len(data), size):
+            block = HostCipher.__xor(data[i:i+size], keystream)
+            blocks.append(block)
+            keystream = self.__ecb.encrypt(block) if len(block) == size else None
+        return b''.join(blocks)
+
+    def decrypt(self, data: bytes) -> bytes:
+        """Decrypt the data.
+
+        :param data: The ciphertext.
+        :returns The plaintext.
+        """
+        size = HostCipher.block_size
+        if len(data) <= size:
+            return HostCipher.__xor(data, self.__keystream)
+        blocks = [HostCipher.__xor(data[:size], self.__keystream)]
+        for i in range(size, len(data), size):
+            keystream = self.__ecb.encrypt(data[i-size:i])
+            blocks.append(HostCipher.__xor(data[i:i+size], keystream))
+        return b''.join(blocks)
+
+
 class Gzhmu:
     """To log in websites of GMU and access intranet resources with ease.
 
@@ -167,10 +227,19 @@ class Gzhmu:
         See `https://docs.python-requests.org/en/latest/user/advanced/#proxies` in detail.
     :param verify: Whether to verify server's TLS certificate.
     :param timeout: Timeout for every individual requests.
+    :param session_store: A gzhmu.store.SessionStore object. If set, the 
+        stored session of the username is resumed and the session is 
+        saved after every login, so that Gzhmu.login only logs in from 
+        scratch when the stored session has expired.
     """
 
     key = b'wrdvpnisthebest!'
     iv = b'wrdvpnisthebest!'
+    host_cipher = HostCipher(key, iv)
+
+    # Memoize the web VPN prefixes of the URLs per protocol, host and port.
+    encrypt_url_cache = LRUCache(256)
+    decrypt_url_cache = LRUCache(256)
 
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.5410.0 Safari/537.36',
@@ -181,7 +250,8 @@ class Gzhmu:
                  webvpn: Optional[bool] = False, 
                  proxies: Optional[Union[None, dict]] = None, 
                  verify: Optional[Union[None, bool]] = True, 
-                 timeout: Optional[Union[int ,float]] = 10):
+                 timeout: Optional[Union[int ,float]] = 10, 
+                 session_store: Optional[Union[None, SessionStore]] = None):
         if username is not None:
             self.set_username(username)
         else:
@@ -204,6 +274,9 @@ class Gzhmu:
         self.__ticket = None
         self.__access_token = None
 
+        self.__session_store = session_store
+        self.restore_session()
+
     @staticmethod
     def is_valid_username(username: Union[str, int]) -> bool:
         """Check if a username is valid.
@@ -237,7 +310,7 @@ class Gzhmu:
                     response.headers.get('Location') == 'https://webvpn.gzhmu.edu.cn/https/77726476706e69737468656265737421e0f85388263c2657640084b9d6502720b7aa6c/portal')
 
     @staticmethod
-    def __get_execution(html: str, formid: str) -> str:
+    def get_execution(html: str, formid: str) -> str:
         """Get the value of a label named 'execution' from a specific form tag in HTML.
 
         The execution is in one of the form tags in an HTML text, 
@@ -257,6 +330,29 @@ class Gzhmu:
         end = html.find('"', start)
         return html[start:end]
 
+    @staticmethod
+    def check_login_result(status_code: int, html: str):
+        """Check the result of posting the login form.
+
+        :param status_code: The status code of the response.
+        :param html: The HTML text of the response.
+        :raises LoginFailedException, IncorrectCredentialException or 
+            IncorrectVerificationCodeException if failed to log in.
+        """
+        if status_code != requests.codes.UNAUTHORIZED:
+            return
+        alert_pattern = '<div class="alert alert-danger">'
+        alert_start = html.find(alert_pattern)
+        if alert_start == -1:
+            raise LoginFailedException('unknow failure, alert message not found')
+        alert_end = html.find('</div>', alert_start)
+        msg = html[alert_start:alert_end]
+
+        if '用户名或密码错误，请检查后重试！' in msg:
+            raise IncorrectCredentialException()
+        elif '验证码错误' in msg:
+            raise IncorrectVerificationCodeException()
+
     @staticmethod
     def encrypt_host(host: str) -> str:
         """Encrypt a hostname.
@@ -268,9 +364,8 @@ class Gzhmu:
         :param host: Hostname to encrypt.
         :returns An encrypted hostname.
         """
-        cipher = AES.new(Gzhmu.key, AES.MODE_CFB, iv=Gzhmu.iv, segment_size=128)
-        decrypted = cipher.encrypt(host.encode())
-        return Gzhmu.iv.hex() + decrypted.hex()
+        encrypted = Gzhmu.host_cipher.encrypt(host.encode())
+        return Gzhmu.iv.hex() + encrypted.hex()
 
     @staticmethod
     def decrypt_host(encrypted_host: str) -> str:
@@ -283,11 +378,10 @@ class Gzhmu:
         :param encrypted_host: The encrypted hostname.
         :returns An decrypted hostname.
         """
-        cipher = AES.new(Gzhmu.key, AES.MODE_CFB, iv=Gzhmu.iv, segment_size=128)
         iv_hex = Gzhmu.iv.hex()
         if encrypted_host.startswith(iv_hex):
             encrypted_host = encrypted_host[len(iv_hex):]
-        host = cipher.decrypt(bytes.fromhex(encrypted_host))
+        host = Gzhmu.host_cipher.decrypt(bytes.fromhex(encrypted_host))
         return host.decode('utf-8')
 
     @staticmethod
@@ -298,20 +392,25 @@ class Gzhmu:
         e.g. encrypt `http://jwgl.gzhmu.edu.cn/jsxsd/` will be converted to 
         `https://webvpn.gzhmu.edu.cn/http/77726476706e69737468656265737421fae0469069377258731dc7a99c406d36d6/jsxsd/`.
 
+        The web VPN prefix of every protocol, host and port is cached in 
+        Gzhmu.encrypt_url_cache, whose hits and misses are available 
+        through its get_info method, so only the path, query and 
+        fragment are rebuilt per call.
+
         :param url: The URL to encrypt.
         :returns An encrypted URL.
         """
-        parsed_result = urlparse(url)
-        protocol = parsed_result.scheme
-        host = parsed_result.hostname
-        port = parsed_result.port
-
-        encrypted_host = Gzhmu.encrypt_host(host)
-        path = '/'.join(['/'+protocol+('-'+str(port) if port else ''), 
-                         encrypted_host])
-        path += parsed_result.path
-        url = urlunparse(('https', 'webvpn.gzhmu.edu.cn', path) + parsed_result[3:])
-        return url
+        parsed_result = urlsplit(url)
+        key = (parsed_result.scheme, parsed_result.netloc)
+        prefix = Gzhmu.encrypt_url_cache.get(key)
+        if prefix is None:
+            protocol = parsed_result.scheme
+            port = parsed_result.port
+            encrypted_host = Gzhmu.encrypt_host(parsed_result.hostname)
+            prefix = 'https://webvpn.gzhmu.edu.cn/' + protocol \
+                   + ('-'+str(port) if port else '') + '/' + encrypted_host
+            Gzhmu.encrypt_url_cache.put(key, prefix)
+        return prefix + Gzhmu.__url_tail(parsed_result)
 
     @staticmethod
     def decrypt_url(encrypted_url: str) -> str:
@@ -328,7 +427,7 @@ class Gzhmu:
         webvpn_url = 'https://webvpn.gzhmu.edu.cn'
         if not encrypted_url.startswith(webvpn_url):
             return
-        parsed_url = urlparse(encrypted_url)
+        parsed_url = urlsplit(encrypted_url)
         end_of_protocol = parsed_url.path.find('/', 1)
         if end_of_protocol == -1:
             return
@@ -336,18 +435,138 @@ class Gzhmu:
         if end_of_encrypted_host == -1:
             return
 
-        splited = parsed_url.path[1:end_of_protocol].split('-')
-        if len(splited) == 1:
-            protocol = splited[0]
-            port = ''
-        else:
-            protocol, port = splited
-        encrypted_host = parsed_url.path[end_of_protocol+1:end_of_encrypted_host]
-        host = Gzhmu.decrypt_host(encrypted_host)
-        netloc = host + (':'+port if len(port) > 0 else '')
+        key = parsed_url.path[:end_of_encrypted_host]
+        prefix = Gzhmu.decrypt_url_cache.get(key)
+        if prefix is None:
+            splited = parsed_url.path[1:end_of_protocol].split('-')
+            if len(splited) == 1:
+                protocol = splited[0]
+                port = ''
+            else:
+                protocol, port = splited
+            encrypted_host = parsed_url.path[end_of_protocol+1:end_of_encrypted_host]
+            host = Gzhmu.decrypt_host(encrypted_host)
+            netloc = host + (':'+port if len(port) > 0 else '')
+            prefix = protocol + '://' + netloc
+            Gzhmu.decrypt_url_cache.put(key, prefix)
         path = parsed_url.path[end_of_encrypted_host:]
-        url = urlunparse((protocol, netloc, path) + parsed_url[3:])
-        return url
+        return prefix + Gzhmu.__url_tail(parsed_url._replace(path=path))
+
+    @staticmethod
+    def decrypt_html(content: Union[str, bytes, Iterable[Union[str, bytes]]]) \
+            -> Iterator[Union[str, bytes]]:
+        """Decrypt all the web VPN URLs in an HTML document.
+
+        Pages fetched with web VPN have every link rewritten to 
+        `https://webvpn.gzhmu.edu.cn/<protocol>/<encrypted host>/...`, 
+        this method converts them back to `<protocol>://<host>/...`, 
+        e.g. convert `<a href="https://webvpn.gzhmu.edu.cn/http/77726476706e69737468656265737421fae0469069377258731dc7a99c406d36d6/jsxsd/">` 
+        to `<a href="http://jwgl.gzhmu.edu.cn/jsxsd/">`.
+
+        The document is processed chunk by chunk, keeping only the tail 
+        that may contain an incomplete URL, and every encrypted host is 
+        decrypted only once. URLs which can't be decrypted are left as 
+        they are.
+
+            >>> from gzhmu import WebVPN
+            >>> vpn = WebVPN('xxxxxxxxxx', 'xxxxxxxx')
+            >>> res = vpn.login()
+            >>> resp = vpn.get('http://jwgl.gzhmu.edu.cn/jsxsd/', stream=True)
+            >>> with open('index.html', 'wb') as fp:
+            ...     for chunk in WebVPN.decrypt_html(resp.iter_content(65536)):
+            ...         fp.write(chunk)
+            ... 
+
+        :param content: The document in str or bytes, or an iterable 
+            of chunks in str or bytes, e.g. requests.Response.iter_content.
+        :returns An iterator of the decrypted chunks, of the same type 
+            as the input.
+        """
+        if isinstance(content, (str, bytes)):
+            content = (content,)
+        hosts = {}
+        carry = None
+        for chunk in content:
+            if carry is None:
+                carry = chunk[:0]
+            buffer = carry + chunk
+            result, carry = Gzhmu.__decrypt_html_buffer(buffer, hosts, False)
+            if result:
+                yield result
+        if carry:
+            result, _ = Gzhmu.__decrypt_html_buffer(carry, hosts, True)
+            yield result
+
+    # Protocol, optional port and encrypted host of a web VPN URL.
+    __webvpn_url_pattern = re.compile(
+        r'https://webvpn\.gzhmu\.edu\.cn/([a-z][a-z0-9+.]{0,15})(?:-(\d{1,5}))?/([0-9a-f]{1,600})')
+    __webvpn_url_bytes_pattern = re.compile(__webvpn_url_pattern.pattern.encode())
+    # The longest possible match of the patterns above.
+    __webvpn_url_max_length = 28 + 16 + 6 + 1 + 600
+
+    @staticmethod
+    def __decrypt_html_buffer(buffer: Union[str, bytes], hosts: dict, 
+                              final: bool) -> Tuple[Union[str, bytes], Union[str, bytes]]:
+        """Decrypt the web VPN URLs in a buffer.
+
+        :param buffer: The text to decrypt.
+        :param hosts: The decrypted origins of the matched URLs, 
+            None if the URL can't be decrypted.
+        :param final: Whether the buffer is the end of the document.
+        :returns A tuple of the decrypted text and the rest of the buffer 
+            which may contain an incomplete URL.
+        """
+        is_bytes = isinstance(buffer, bytes)
+        if is_bytes:
+            pattern = Gzhmu.__webvpn_url_bytes_pattern
+        else:
+            pattern = Gzhmu.__webvpn_url_pattern
+        limit = len(buffer) if final else len(buffer) - Gzhmu.__webvpn_url_max_length
+
+        pieces = []
+        pos = 0
+        for match in pattern.finditer(buffer):
+            if match.start() >= limit:
+                break
+            key = match.group(0)
+            origin = hosts.get(key, False)
+            if origin is False:
+                origin = Gzhmu.__decrypt_origin(*(
+                    g.decode() if is_bytes and g is not None else g
+                    for g in match.groups()))
+                if origin is not None and is_bytes:
+                    origin = origin.encode()
+                hosts[key] = origin
+            if origin is None:
+                continue
+            pieces.append(buffer[pos:match.start()])
+            pieces.append(origin)
+            pos = match.end()
+        end = max(pos, limit)
+        pieces.append(buffer[pos:end])
+        return buffer[:0].join(pieces), buffer[end:]
+
+    @staticmethod
+    def __decrypt_origin(protocol: str, port: Optional[str], 
+                         encrypted_host: str) -> Optional[str]:
+        """Get `<protocol>://<host>[:<port>]` of a web VPN URL, or None if invalid."""
+        try:
+            host = Gzhmu.decrypt_host(encrypted_host)
+        except ValueError:
+            return None
+        if not host or not re.fullmatch(r'[0-9A-Za-z.\-\[\]:]+', host):
+            return None
+        return protocol + '://' + host + (':'+port if port else '')
+
+    @staticmethod
+    def __url_tail(parsed_url: SplitResult) -> str:
+        """Get the path, query and fragment of a URL split by urlsplit."""
+        tail = parsed_url.path
+        if parsed_url.query:
+            tail += '?' + parsed_url.query
+        if parsed_url.fragment:
+            tail += '#' + parsed_url.fragment
+        return tail
 
     @staticmethod
     def get_contact(username: Union[str, int], 
@@ -370,7 +589,7 @@ class Gzhmu:
         response = gmu.get(url, **kwargs)
 
         data = {
-            'execution': Gzhmu.__get_execution(response.text, 'passwordManagementForm'),
+            'execution': Gzhmu.get_execution(response.text, 'passwordManagementForm'),
             '_eventId': 'customResetPassword'
         }
         response = gmu.post(url, data=data, **kwargs)
@@ -378,7 +597,7 @@ class Gzhmu:
         data = {
             'username': username,
             'captcha': gmu.bypass_captcha(),
-            'execution': Gzhmu.__get_execution(response.text, 'resetPasswordForm'),
+            'execution': Gzhmu.get_execution(response.text, 'resetPasswordForm'),
             '_eventId': 'submit',
             'submit': None
         }
@@ -462,6 +681,52 @@ class Gzhmu:
         """
         self.__webvpn = bool(state)
 
+    def get_session_store(self) -> SessionStore:
+        """Get the session store.
+
+        :returns A gzhmu.store.SessionStore object, or None if not set.
+        """
+        return self.__session_store
+
+    def set_session_store(self, session_store: SessionStore):
+        """Set the session store.
+
+        :param session_store: A gzhmu.store.SessionStore object, or None 
+            to disable it.
+        """
+        self.__session_store = session_store
+
+    def save_session(self):
+        """Save the current session into the session store.
+
+        Do nothing if the session store or the username is not set.
+        """
+        if self.__session_store is None or self.__username is None:
+            return
+        state = {
+            'cookies': dump_cookies(self.__session.cookies),
+            'ticket': self.__ticket,
+            'webvpn': self.__webvpn,
+            'saved_at': time.time(),
+        }
+        self.__session_store.save(self.__username, state)
+
+    def restore_session(self) -> bool:
+        """Resume the session stored in the session store.
+
+        A session stored with a different web VPN setting is ignored.
+
+        :returns True if a stored session is resumed, or False if not.
+        """
+        if self.__session_store is None or self.__username is None:
+            return False
+        state = self.__session_store.load(self.__username)
+        if state is None or state.get('webvpn') != self.__webvpn:
+            return False
+        load_cookies(self.__session.cookies, state.get('cookies', []))
+        self.__ticket = state.get('ticket')
+        return True
+
     def get_proxies(self) -> dict:
         """Get the currently in use proxies for each individual requests.
 
@@ -518,24 +783,58 @@ class Gzhmu:
         data = result['data']
         return base64.b64decode(data[data.index(',')+1:])
 
-    def bypass_captcha(self) -> int:
+    def bypass_captcha_with_confidence(self) -> Tuple[int, float]:
+        """Bypass the captcha and tell how confident the result is.
+
+        :returns A tuple of the verification code and the confidence 
+            ranging from 0 to 1. See gzhmu.captcha.recognize_png.
+        """
+        captcha_bytes = self.get_captcha_img()
+        return recognize_png(captcha_bytes)
+
+    def bypass_captcha(self, threshold: Optional[Union[None, float]] = None, 
+                       max_refetches: Optional[int] = 5) -> int:
         """Bypass the captcha.
 
         Get the CAPTCHA image and recognize it, then get the verification code.
 
+        If threshold is set, a new CAPTCHA image is fetched as long as the 
+        confidence of the result is lower than threshold, since fetching 
+        an image is much cheaper than a failed login. Only the latest 
+        CAPTCHA is valid, so its code is returned even if the confidence 
+        is still lower than threshold after max_refetches times.
+
+        :param threshold: The lowest acceptable confidence, ranging from 0 to 1.
+        :param max_refetches: The max number of times to fetch a new image.
         :returns The verification code.
         """
-        captcha_bytes = self.get_captcha_img()
-        image = Image.open(BytesIO(captcha_bytes))
-        captcha_array = np.array(image)
-        captcha_result = recognize(captcha_array)
+        captcha_result, confidence = self.bypass_captcha_with_confidence()
+        refetches = 0
+        while threshold is not None and confidence < threshold \
+                and refetches < max_refetches:
+            captcha_result, confidence = self.bypass_captcha_with_confidence()
+            refetches += 1
         return captcha_result
 
-    def login(self, service: Optional[str] = 'https://portal.gzhmu.edu.cn/portal/login/') -> bool:
+    def login(self, service: Optional[str] = 'https://portal.gzhmu.edu.cn/portal/login/', 
+              captcha_threshold: Optional[Union[None, float]] = None, 
+              max_captcha_refetches: Optional[int] = 5, 
+              max_retries: Optional[int] = 0) -> bool:
         """Log in the portal and authorize the specific service.
 
         :param service: Set the URL of the service to authorize, 
             so that you can access the resources of the service after login.
+        :param captcha_threshold: If set, fetch a new CAPTCHA image before 
+            submitting the form when the confidence of the recognition is 
+            lower than it. See Gzhmu.bypass_captcha.
+        :param max_captcha_refetches: The max number of times to fetch a 
+            new CAPTCHA image.
+        :param max_retries: The max number of times to resubmit the form 
+            with a new CAPTCHA when the verification code is incorrect. 
+            The login HTML and the execution are not fetched again. 
+            LoginFailedMaxRetriesException is raised if all the retries 
+            fail. Default to 0, which raises IncorrectVerificationCodeException 
+            on the first failure.
         :returns Always True if log in successfully.
         """
         if self.__username is None:
@@ -553,40 +852,44 @@ class Gzhmu:
         login_url = 'https://sso.gzhmu.edu.cn/cas/login?' + urlencode(query)
 
         login_html = self.get_login_html(service)
-        execution = Gzhmu.__get_execution(login_html, 'fm1')
+        execution = Gzhmu.get_execution(login_html, 'fm1')
 
         # Logged in already.
         if execution is None:
             # Authorizate specific service.
             self.get(login_url, allow_redirects=False)
+            self.save_session()
             return True
 
-        captcha_result = self.bypass_captcha()
-        # Post login form data
-        formdata = {
-            'username': self.__username,
-            'password': self.__password,
-            'captcha': captcha_result,
-            '_eventId': 'submit',
-            'geolocation': '',
-            'execution': execution,
-        }
-        response = self.post(login_url, data=formdata, allow_redirects=self.__webvpn)
-
-        # Check login result
-        html = response.content.decode('utf-8')
-        if response.status_code == requests.codes.UNAUTHORIZED:
-            alert_pattern = '<div class="alert alert-danger">'
-            alert_start = html.find(alert_pattern)
-            if alert_start == -1:
-                raise LoginFailedException('unknow failure, alert message not found')
-            alert_end = response.text.find('</div>', alert_start)
-            msg = html[alert_start:alert_end]
-
-            if '用户名或密码错误，请检查后重试！' in msg:
-                raise IncorrectCredentialException()
-            elif '验证码错误' in msg:
-                raise IncorrectVerificationCodeException()
+        captcha_result = self.bypass_captcha(captcha_threshold, max_captcha_refetches)
+        retries = 0
+        while True:
+            # Post login form data
+            formdata = {
+                'username': self.__username,
+                'password': self.__password,
+                'captcha': captcha_result,
+                '_eventId': 'submit',
+                'geolocation': '',
+                'execution': execution,
+            }
+            response = self.post(login_url, data=formdata, allow_redirects=self.__webvpn)
+
+            # Check login result
+            html = response.content.decode('utf-8')
+            try:
+                Gzhmu.check_login_result(response.status_code, html)
+            except IncorrectVerificationCodeException:
+                if retries >= max_retries:
+                    if max_retries > 0:
+                        raise LoginFailedMaxRetriesException(max_retries)
+                    raise
+                # Stay in the same login flow, only the CAPTCHA is renewed.
+                retries += 1
+                execution = Gzhmu.get_execution(html, 'fm1') or execution
+                captcha_result = self.bypass_captcha(captcha_threshold, max_captcha_refetches)
+                continue
+            break
 
         # Authorize Web VPN
         if self.__webvpn:
@@ -618,10 +921,14 @@ class Gzhmu:
                                         requests.codes.MOVED_PERMANENTLY]:
             raise LoginFailedException('unknow failure, alert message not found')
 
+        self.save_session()
         return True
 
     def logout(self):
         """Log out the account."""
+        if self.__session_store is not None and self.__username is not None:
+            self.__session_store.delete(self.__username)
+
         if self.__webvpn is True:
             url = 'https://webvpn.gzhmu.edu.cn/logout'
             self.get(url)
@@ -705,9 +1012,13 @@ class WebVPN(Gzhmu):
     :param proxies: Use a proxy for every individual requests.
         See `https://docs.python-requests.org/en/latest/user/advanced/#proxies` in detail.
     :param verify: Whether to verify server's TLS certificate.
+    :param session_store: A gzhmu.store.SessionStore object to save 
+        and resume the session. See Gzhmu for more details.
     """
     def __init__(self, username: Optional[Union[None, str, int]] = None, 
                  password: Optional[Union[None, str]] = None, 
                  proxies: Optional[Union[None, dict]] = None,
-                 verify: Optional[Union[None, bool]] = True):
-        super().__init__(username, password, webvpn=True, proxies=proxies, verify=verify)
+                 verify: Optional[Union[None, bool]] = True, 
+                 session_store: Optional[Union[None, SessionStore]] = None):
+        super().__init__(username, password, webvpn=True, proxies=proxies, verify=verify, 
+                         session_store=session_store)
@@ -0,0 +1,222 @@
+"""Keep a device logged in to the campus network
+
+KeepAlive probes the status page of the eportal every few seconds with
+gzhmu.gmuapi.checkStatus, which is on campus, so a probe neither leaves
+the campus network nor takes an unreachable internet as logged out.
+When the eportal reports the device logged out, it logs in with
+gzhmu.gmuapi.login immediately, and records the latency from the
+detection to the recovery. A probe which fails to reach the eportal is
+counted separately, and does not trigger a login.
+
+Examples:
+
+    Keep a lab machine online in a background thread:
+
+        >>> from gzhmu import KeepAlive
+        >>> keepalive = KeepAlive('xxxxxxxxxx', 'xxxxxxxxxx', interval=2)
+        >>> keepalive.start()
+        >>> # ...
+        >>> print(keepalive.get_metrics())
+        >>> keepalive.stop()
+
+    Or run it in the foreground until interrupted:
+
+        >>> KeepAlive('xxxxxxxxxx', 'xxxxxxxxxx').run()
+"""
+
+import time
+import threading
+from collections import deque, namedtuple
+from typing import Union, Optional
+
+import requests
+
+from .gmuapi import IncorrectAccountOrPasswordException, AlreadyLoggedInException, \
+                    get_api_session, login, checkStatus
+
+
+KeepAliveMetrics = namedtuple('KeepAliveMetrics', [
+    'probes',           # Number of probes.
+    'drops',            # Number of times the loss of authentication is detected.
+    'recoveries',       # Number of times it is recovered.
+    'login_failures',   # Number of failed logins.
+    'probe_failures',   # Number of probes which fail to reach the eportal.
+    'last_latency',     # Seconds from the last detection to its recovery.
+    'mean_latency',     # Mean of the recent latencies.
+    'max_latency',      # Max of the recent latencies.
+    'is_online',        # Result of the last probe or login, None if unknown.
+])
+
+
+class KeepAlive:
+    """Keep an account logged in to the campus network.
+
+    :param account: The account of the campus network.
+    :param password: The password.
+    :param interval: The seconds between two probes while online.
+    :param probe_timeout: The timeout of a probe.
+    :param retry_interval: The seconds to wait after a probe which fails
+        to reach the eportal, or a login which fails for other reasons
+        than the credential, e.g. a network error.
+    :param backoff_base: The seconds to wait after the first
+        IncorrectAccountOrPasswordException, doubled per failure.
+    :param backoff_max: The max seconds to wait between two logins.
+    :param max_latencies: The number of recent latencies to keep.
+    :param session: The requests.Session to probe and log in with,
+        default to the one of gzhmu.gmuapi.get_api_session.
+    :param kwargs: Arguments for gzhmu.gmuapi.login.
+    """
+
+    def __init__(self, account: Union[str, int], password: str,
+                 interval: Optional[float] = 5,
+                 probe_timeout: Optional[float] = 2,
+                 retry_interval: Optional[float] = 1,
+                 backoff_base: Optional[float] = 5,
+                 backoff_max: Optional[float] = 300,
+                 max_latencies: Optional[int] = 100,
+                 session: Optional[Union[None, requests.Session]] = None,
+                 **kwargs):
+        self.__account = str(account)
+        self.__password = password
+        self.__interval = float(interval)
+        self.__probe_timeout = probe_timeout
+        self.__retry_interval = float(retry_interval)
+        self.__backoff_base = float(backoff_base)
+        self.__backoff_max = float(backoff_max)
+        self.__session = session
+        self.__kwargs = kwargs
+
+        self.__lock = threading.Lock()
+        self.__probes = 0
+        self.__drops = 0
+        self.__recoveries = 0
+        self.__login_failures = 0
+        self.__probe_failures = 0
+        self.__latencies = deque(maxlen=max_latencies)
+        self.__is_online = None
+        # Monotonic time the current loss is detected at, None if online.
+        self.__detected_at = None
+        # Number of IncorrectAccountOrPasswordException in a row.
+        self.__credential_failures = 0
+
+        self.__stop_event = threading.Event()
+        self.__thread = None
+
+    def get_session(self) -> requests.Session:
+        """Get the session to probe and log in with."""
+        if self.__session is None:
+            return get_api_session()
+        return self.__session
+
+    def probe(self) -> Optional[bool]:
+        """Check whether the device is authenticated with the eportal.
+
+        :return True if logged in, False if not, or None if the eportal
+            is not reachable.
+        """
+        try:
+            return checkStatus(session=self.get_session(), timeout=self.__probe_timeout)
+        except Exception:
+            return None
+
+    def check(self) -> float:
+        """Probe once, and log in if not authenticated.
+
+        :return The seconds to wait before the next check.
+        """
+        is_online = self.probe()
+        with self.__lock:
+            self.__probes += 1
+            if is_online is None:
+                self.__probe_failures += 1
+                self.__is_online = None
+                return self.__retry_interval
+            if is_online:
+                self.__is_online = True
+                if self.__detected_at is not None:
+                    self.__recover()
+                return self.__interval
+            if self.__detected_at is None:
+                self.__detected_at = time.monotonic()
+                self.__drops += 1
+            self.__is_online = False
+
+        try:
+            kwargs = dict(self.__kwargs)
+            if self.__session is not None:
+                kwargs.setdefault('session', self.__session)
+            is_online = login(self.__account, self.__password, **kwargs)
+        except AlreadyLoggedInException:
+            # Only a probe confirms the recovery, the eportal may report
+            # the account as logged in on another device.
+            is_online = self.probe()
+            with self.__lock:
+                self.__probes += 1
+        except IncorrectAccountOrPasswordException:
+            with self.__lock:
+                self.__login_failures += 1
+                self.__credential_failures += 1
+                backoff = self.__backoff_base * 2 ** (self.__credential_failures - 1)
+            return min(backoff, self.__backoff_max)
+        except Exception:
+            is_online = False
+
+        with self.__lock:
+            if is_online is None:
+                self.__probe_failures += 1
+                return self.__retry_interval
+            if not is_online:
+                self.__login_failures += 1
+                return self.__retry_interval
+            self.__is_online = True
+            self.__recover()
+        return self.__interval
+
+    def __recover(self):
+        """Record the latency of the current loss. Call with the lock held."""
+        self.__latencies.append(time.monotonic() - self.__detected_at)
+        self.__recoveries += 1
+        self.__detected_at = None
+        self.__credential_failures = 0
+
+    def run(self):
+        """Check repeatedly until KeepAlive.stop is called."""
+        while not self.__stop_event.is_set():
+            self.__stop_event.wait(self.check())
+        self.__stop_event.clear()
+
+    def start(self):
+        """Run in a daemon thread."""
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+        self.__thread = threading.Thread(target=self.run, daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout: Optional[Union[None, float]] = None):
+        """Stop running, and wait for the thread started by KeepAlive.start.
+
+        :param timeout: The max seconds to wait for the thread.
+        """
+        self.__stop_event.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def is_running(self) -> bool:
+        """Check whether the thread started by KeepAlive.start is running."""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def get_metrics(self) -> KeepAliveMetrics:
+        """Get the probes, drops, recoveries, login failures and latencies.
+
+        :return A KeepAliveMetrics named tuple.
+        """
+        with self.__lock:
+            latencies = list(self.__latencies)
+            return KeepAliveMetrics(
+                self.__probes, self.__drops, self.__recoveries, self.__login_failures,
+                self.__probe_failures,
+                latencies[-1] if latencies else None,
+                sum(latencies) / len(latencies) if latencies else None,
+                max(latencies) if latencies else None,
+                self.__is_online)
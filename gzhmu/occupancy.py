@@ -0,0 +1,194 @@
+"""Occupancy matrix of library seats
+
+OccupancyMatrix converts the results of GmuLib.get_seat_info into a
+dense numpy array with a row per seat and a column per time slot, so
+that the analytics of a snapshot of the whole campus are computed with
+vectorized operations instead of loops over Record objects.
+
+Examples:
+
+    Get the utilization of every room from 8:00 to 22:00 per 5 minutes:
+
+        >>> import datetime
+        >>> from gzhmu import GmuLib, OccupancyMatrix
+        >>> lib = GmuLib('xxxxxxxxxx', 'xxxxxxxxxx')
+        >>> res = lib.login()
+        >>> today = datetime.date.today()
+        >>> occupancy = OccupancyMatrix(lib.get_seat_info(starttime=datetime.time(8)),
+        ...                             datetime.datetime.combine(today, datetime.time(8)),
+        ...                             datetime.datetime.combine(today, datetime.time(22)),
+        ...                             slot_minutes=5)
+        >>> for room_id, utilization in occupancy.room_utilization().items():
+        ...     peaks = OccupancyMatrix.find_peaks(utilization)
+        ...     print(room_id, utilization.mean(), [occupancy.get_slot_times()[i] for i in peaks])
+        ...
+"""
+
+import datetime
+from typing import Iterable, List, Dict, Optional
+
+import numpy as np
+
+from .gmulib import Seat, SeatInfo
+
+
+# Codes of the slots of the matrix.
+FREE = 0
+RESERVED = 1
+VALIDATED = 2
+
+
+class OccupancyMatrix:
+    """A seats x time slots matrix of the reservations.
+
+    A slot is VALIDATED if a validated reservation covers any part of
+    it, or RESERVED if an unvalidated one does, or FREE otherwise. The
+    codes are available as the attributes of the class as well, e.g.
+    OccupancyMatrix.FREE.
+
+    :param seat_infos: A list of SeatInfo objects from GmuLib.get_seat_info.
+    :param start: The start of the first slot.
+    :param end: The end of the slots, the last slot is truncated at it.
+    :param slot_minutes: The length of a slot in minutes.
+    """
+
+    FREE = FREE
+    RESERVED = RESERVED
+    VALIDATED = VALIDATED
+
+    def __init__(self, seat_infos: Iterable[SeatInfo],
+                 start: datetime.datetime, end: datetime.datetime,
+                 slot_minutes: Optional[int] = 5):
+        if slot_minutes <= 0:
+            raise ValueError('slot_minutes must be positive')
+        seat_infos = list(seat_infos)
+        self.__seats = [seat_info.seat for seat_info in seat_infos]
+        self.__room_ids = np.array([seat.room_id for seat in self.__seats], dtype=np.int64)
+        self.__is_open = np.array([seat_info.is_open for seat_info in seat_infos], dtype=bool)
+        self.__start = start
+        self.__slot_minutes = int(slot_minutes)
+        total_minutes = max(0, int((end - start).total_seconds() // 60))
+        n_slots = -(-total_minutes // self.__slot_minutes)
+
+        rows = []
+        starts = []
+        ends = []
+        codes = []
+        for row, seat_info in enumerate(seat_infos):
+            for record in seat_info.records:
+                rows.append(row)
+                starts.append((record.start - start).total_seconds() // 60)
+                ends.append((record.end - start).total_seconds() // 60)
+                codes.append(VALIDATED if record.is_validated else RESERVED)
+        rows = np.array(rows, dtype=np.intp)
+        codes = np.array(codes, dtype=np.uint8)
+        # The slots overlapped by a record, truncated at the end, are [first, last).
+        starts = np.clip(np.array(starts, dtype=np.int64), 0, total_minutes)
+        ends = np.clip(np.array(ends, dtype=np.int64), 0, total_minutes)
+        keep = starts < ends
+        first = starts // self.__slot_minutes
+        last = -(-ends // self.__slot_minutes)
+
+        # Count the covering records per code with difference arrays.
+        matrix = np.zeros((len(self.__seats), n_slots), dtype=np.uint8)
+        for code in (RESERVED, VALIDATED):
+            selected = keep & (codes == code)
+            diff = np.zeros((len(self.__seats), n_slots + 1), dtype=np.int32)
+            np.add.at(diff, (rows[selected], first[selected]), 1)
+            np.add.at(diff, (rows[selected], last[selected]), -1)
+            covered = np.cumsum(diff[:, :-1], axis=1) > 0
+            matrix[covered] = code
+        self.__matrix = matrix
+
+    def get_matrix(self) -> np.ndarray:
+        """Get the matrix of FREE, RESERVED and VALIDATED in uint8,
+        whose rows are in the order of OccupancyMatrix.get_seats."""
+        return self.__matrix
+
+    def get_seats(self) -> List[Seat]:
+        """Get the seats of the rows."""
+        return list(self.__seats)
+
+    def get_room_ids(self) -> np.ndarray:
+        """Get the room IDs of the rows."""
+        return self.__room_ids
+
+    def get_is_open(self) -> np.ndarray:
+        """Get whether the seats of the rows are open."""
+        return self.__is_open
+
+    def get_slot_minutes(self) -> int:
+        """Get the length of a slot in minutes."""
+        return self.__slot_minutes
+
+    def get_slot_times(self) -> List[datetime.datetime]:
+        """Get the start times of the slots."""
+        step = datetime.timedelta(minutes=self.__slot_minutes)
+        return [self.__start + step * i for i in range(self.__matrix.shape[1])]
+
+    def room_utilization(self, validated_only: Optional[bool] = False,
+                         open_only: Optional[bool] = True) -> Dict[int, np.ndarray]:
+        """Get the fraction of occupied seats per room per slot.
+
+        :param validated_only: Whether to count VALIDATED slots only,
+            otherwise RESERVED slots are counted as well.
+        :param open_only: Whether to exclude the seats which are not open.
+        :return A dict of room IDs and arrays of fractions per slot.
+        """
+        occupied = self.__matrix == VALIDATED if validated_only else self.__matrix != FREE
+        room_ids = self.__room_ids
+        if open_only:
+            occupied = occupied[self.__is_open]
+            room_ids = room_ids[self.__is_open]
+        unique_ids, inverse, counts = np.unique(room_ids, return_inverse=True,
+                                                return_counts=True)
+        sums = np.zeros((len(unique_ids), occupied.shape[1]), dtype=np.int64)
+        np.add.at(sums, inverse, occupied)
+        utilization = sums / counts[:, np.newaxis]
+        return {int(room_id): utilization[i] for i, room_id in enumerate(unique_ids)}
+
+    @staticmethod
+    def find_peaks(series: np.ndarray, min_height: Optional[float] = None) -> np.ndarray:
+        """Find the local maxima of a series, e.g. the utilization of a room.
+
+        A plateau counts as one peak at its first slot.
+
+        :param series: A 1-D array.
+        :param min_height: Only the peaks at least as high as it.
+        :return An array of the indexes of the peaks.
+        """
+        series = np.asarray(series)
+        if series.size == 0:
+            return np.zeros(0, dtype=np.intp)
+        # Collapse plateaus to their first slots.
+        changes = np.flatnonzero(np.diff(series)) + 1
+        firsts = np.concatenate([[0], changes])
+        values = series[firsts]
+        padded = np.concatenate([[-np.inf], values, [-np.inf]])
+        is_peak = (values > padded[:-2]) & (values > padded[2:])
+        if min_height is not None:
+            is_peak &= values >= min_height
+        return firsts[is_peak]
+
+    def free_runs(self) -> np.ndarray:
+        """Get the number of FREE slots in a row from every slot.
+
+        :return An int array of the same shape as the matrix, 0 where
+            the slot is not FREE.
+        """
+        free = self.__matrix[:, ::-1] == FREE
+        n_slots = free.shape[1]
+        positions = np.arange(1, n_slots + 1)
+        # The last occupied position before every slot, in reverse order.
+        resets = np.maximum.accumulate(np.where(free, 0, positions), axis=1)
+        runs = np.where(free, positions - resets, 0)
+        return runs[:, ::-1]
+
+    def longest_free_runs(self) -> np.ndarray:
+        """Get the length of the longest run of FREE slots of every seat.
+
+        :return An int array of the number of slots per seat.
+        """
+        if self.__matrix.shape[1] == 0:
+            return np.zeros(len(self.__seats), dtype=np.int64)
+        return self.free_runs().max(axis=1)
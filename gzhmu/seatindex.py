@@ -0,0 +1,240 @@
+"""Interval index of the reservations of library seats
+
+SeatIndex is built once from the results of GmuLib.get_seat_info, and
+answers which seats are free in a period, or the longest free block
+of every seat, with vectorized binary searches instead of scanning
+the records of every seat per query.
+
+Examples:
+
+    Find the seats free from 14:00 to 18:00 in a room:
+
+        >>> from datetime import time
+        >>> from gzhmu import GmuLib, SeatIndex
+        >>> lib = GmuLib('xxxxxxxxxx', 'xxxxxxxxxx')
+        >>> res = lib.login()
+        >>> room = lib.get_room_with_name('xxx')[0]
+        >>> index = SeatIndex(lib.get_seat_info(room))
+        >>> for seat in index.free_seats(time(14), time(18), room):
+        ...     print(seat.seat_name)
+        ...
+"""
+
+import datetime
+from typing import Union, Optional, List, Tuple, Iterable
+
+import numpy as np
+
+from .gmulib import TargetSeatNotFoundException, Seat, Room, SeatInfo
+
+
+# Width of the key space of a seat, in minutes, i.e. about 8000 years.
+_SEAT_STRIDE = 1 << 32
+# Offset of the minutes, so that the times before the origin are in the
+# key space of their seat as well.
+_MINUTE_BIAS = 1 << 31
+
+_Time = Union[datetime.datetime, datetime.time]
+
+
+class SeatIndex:
+    """An index of the reserved periods of seats.
+
+    The overlapping or adjacent reservations of a seat are merged, and
+    the periods of all the seats are stored in two sorted arrays of
+    seat_index * 2^32 + 2^31 + minute, one of the starts and one of the ends,
+    so the reservation of every seat around a time is found with one
+    numpy.searchsorted call.
+
+    :param seat_infos: A list of SeatInfo objects from GmuLib.get_seat_info.
+    :param date: The date to combine with the datetime.time arguments of
+        the queries, default to the date of the earliest record, or today.
+    """
+
+    def __init__(self, seat_infos: Iterable[SeatInfo],
+                 date: Optional[Union[None, datetime.date]] = None):
+        self.__seat_infos = list(seat_infos)
+        self.__seats = [seat_info.seat for seat_info in self.__seat_infos]
+        self.__positions = {}
+        for i, seat in enumerate(self.__seats):
+            self.__positions.setdefault(seat.seat_id, i)
+        self.__room_ids = np.array([seat.room_id for seat in self.__seats], dtype=np.int64)
+        self.__is_open = np.array([seat_info.is_open for seat_info in self.__seat_infos],
+                                  dtype=bool)
+
+        if date is None:
+            date = min((record.start.date() for seat_info in self.__seat_infos
+                        for record in seat_info.records), default=datetime.date.today())
+        self.__date = date
+        # Minutes are counted from the midnight of the date.
+        self.__origin = datetime.datetime.combine(date, datetime.time())
+
+        starts = []
+        ends = []
+        for i, seat_info in enumerate(self.__seat_infos):
+            periods = sorted((self.__minute(record.start), self.__minute(record.end))
+                             for record in seat_info.records)
+            merged = []
+            for start, end in periods:
+                if end <= start:
+                    continue
+                if merged and start <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            base = i * _SEAT_STRIDE
+            for start, end in merged:
+                starts.append(base + start)
+                ends.append(base + end)
+        self.__starts = np.array(starts, dtype=np.int64)
+        self.__ends = np.array(ends, dtype=np.int64)
+        # The periods of seat i are in [offsets[i], offsets[i+1]).
+        bases = np.arange(len(self.__seats) + 1, dtype=np.int64) * _SEAT_STRIDE
+        self.__offsets = np.searchsorted(self.__starts, bases)
+
+    def __minute(self, time: _Time) -> int:
+        """Convert a datetime, or a time of the date, to the biased minutes
+        from the origin."""
+        if isinstance(time, datetime.time):
+            time = datetime.datetime.combine(self.__date, time)
+        minute = int((time - self.__origin).total_seconds() // 60) + _MINUTE_BIAS
+        if not 0 <= minute < _SEAT_STRIDE:
+            raise ValueError('{} is too far from {}'.format(time, self.__origin))
+        return minute
+
+    def __datetime(self, minute: int) -> datetime.datetime:
+        """Convert the biased minutes from the origin to a datetime."""
+        return self.__origin + datetime.timedelta(minutes=int(minute) - _MINUTE_BIAS)
+
+    def __mask(self, room: Optional[Union[None, Room, int]],
+               open_only: bool) -> np.ndarray:
+        """Get a mask of the seats in a room, and open if open_only."""
+        mask = np.ones(len(self.__seats), dtype=bool)
+        if room is not None:
+            room_id = room.room_id if isinstance(room, Room) else int(room)
+            mask &= self.__room_ids == room_id
+        if open_only:
+            mask &= self.__is_open
+        return mask
+
+    def __position(self, seat: Union[Seat, int]) -> int:
+        """Get the position of a Seat or a seat ID in SeatIndex.get_seats."""
+        seat_id = seat.seat_id if isinstance(seat, Seat) else int(seat)
+        try:
+            return self.__positions[seat_id]
+        except KeyError:
+            raise TargetSeatNotFoundException()
+
+    def get_seats(self) -> List[Seat]:
+        """Get the indexed seats."""
+        return list(self.__seats)
+
+    def get_date(self) -> datetime.date:
+        """Get the date to combine with the datetime.time arguments."""
+        return self.__date
+
+    def free_mask(self, start: _Time, end: _Time) -> np.ndarray:
+        """Check which seats are not reserved in a period.
+
+        :param start: The start of the period.
+        :param end: The end of the period.
+        :return A boolean array in the order of SeatIndex.get_seats.
+        """
+        start = self.__minute(start)
+        end = self.__minute(end)
+        n = len(self.__seats)
+        if n == 0 or len(self.__starts) == 0:
+            return np.ones(n, dtype=bool)
+        bases = np.arange(n, dtype=np.int64) * _SEAT_STRIDE
+        # The last period of every seat which starts before the end.
+        last = np.searchsorted(self.__starts, bases + end, side='left') - 1
+        has_period = last >= self.__offsets[:-1]
+        # Periods of a seat are disjoint, so the last one ends the latest.
+        overlaps = self.__ends[np.maximum(last, 0)] > bases + start
+        return ~(has_period & overlaps)
+
+    def free_seats(self, start: _Time, end: _Time,
+                   room: Optional[Union[None, Room, int]] = None,
+                   open_only: Optional[bool] = True) -> List[Seat]:
+        """Get the seats which are not reserved in a period.
+
+        :param start: The start of the period, a datetime, or a time of
+            the date of the index.
+        :param end: The end of the period.
+        :param room: Only the seats in a Room, or a room ID. All the
+            rooms if None.
+        :param open_only: Whether to exclude the seats which are not open.
+        :return A list of Seat objects.
+        """
+        mask = self.free_mask(start, end) & self.__mask(room, open_only)
+        return [self.__seats[i] for i in np.flatnonzero(mask)]
+
+    def is_free(self, seat: Union[Seat, int], start: _Time, end: _Time) -> bool:
+        """Check whether a seat is not reserved in a period.
+
+        :param seat: A Seat object or a seat ID.
+        :param start: The start of the period.
+        :param end: The end of the period.
+        :return True if free.
+        """
+        return bool(self.free_mask(start, end)[self.__position(seat)])
+
+    def longest_free_blocks(self, start: _Time, end: _Time,
+                            room: Optional[Union[None, Room, int]] = None,
+                            open_only: Optional[bool] = True) \
+            -> List[Tuple[Seat, datetime.datetime, datetime.datetime]]:
+        """Get the longest free block of every seat in a period.
+
+        :param start: The start of the period.
+        :param end: The end of the period.
+        :param room: Only the seats in a Room, or a room ID.
+        :param open_only: Whether to exclude the seats which are not open.
+        :return A list of tuples of the seat, the start and the end of
+            its longest free block, the earliest one if tied, in the order
+            of SeatIndex.get_seats. The start equals the end if the seat
+            is reserved in the whole period.
+        """
+        start = self.__minute(start)
+        end = max(self.__minute(end), start)
+        n = len(self.__seats)
+        seat_of = np.repeat(np.arange(n), np.diff(self.__offsets))
+        bases = seat_of * _SEAT_STRIDE
+        period_starts = np.clip(self.__starts - bases, start, end)
+        period_ends = np.clip(self.__ends - bases, start, end)
+
+        # A free block ends at every period start, and at the end of the
+        # whole period, and starts at the end of the previous period.
+        block_ends = np.concatenate([period_starts, np.full(n, end)])
+        block_seats = np.concatenate([seat_of, np.arange(n)])
+        previous_ends = np.empty_like(period_ends)
+        previous_ends[1:] = period_ends[:-1]
+        is_first = np.ones(len(period_ends), dtype=bool)
+        is_first[1:] = seat_of[1:] != seat_of[:-1]
+        previous_ends[is_first] = start
+        last_ends = np.full(n, start)
+        has_periods = np.diff(self.__offsets) > 0
+        last_ends[has_periods] = period_ends[self.__offsets[1:][has_periods] - 1]
+        block_starts = np.concatenate([previous_ends, last_ends])
+        lengths = block_ends - block_starts
+
+        # Sort by seat, then the longest, then the earliest.
+        order = np.lexsort((block_starts, -lengths, block_seats))
+        best = order[np.searchsorted(block_seats[order], np.arange(n))]
+
+        mask = self.__mask(room, open_only)
+        return [(self.__seats[i], self.__datetime(block_starts[best[i]]),
+                 self.__datetime(block_ends[best[i]]))
+                for i in np.flatnonzero(mask)]
+
+    def longest_free_block(self, seat: Union[Seat, int], start: _Time, end: _Time) \
+            -> Tuple[datetime.datetime, datetime.datetime]:
+        """Get the longest free block of a seat in a period.
+
+        :param seat: A Seat object or a seat ID.
+        :param start: The start of the period.
+        :param end: The end of the period.
+        :return A tuple of the start and the end of the block.
+        """
+        i = self.__position(seat)
+        _, block_start, block_end = self.longest_free_blocks(start, end, open_only=False)[i]
+        return block_start, block_end
@@ -0,0 +1,161 @@
+"""Persistent session stores
+
+Use a session store to save the login state of Gzhmu, WebVPN and
+GmuLib, i.e. the cookies, the ticket and whether web VPN is used,
+per username, so that a new instance, even in a new process, can
+resume the session instead of logging in from scratch.
+
+Examples:
+
+    Resume a session across processes:
+
+        >>> from gzhmu import WebVPN, FileSessionStore
+        >>> username = 'xxxxxxxxxx'
+        >>> password = 'xxxxxxxxxx'
+        >>> vpn = WebVPN(username, password, session_store=FileSessionStore())
+        >>> # Log in fresh only if the stored session has expired.
+        >>> res = vpn.login()
+
+Implement SessionStore to save the sessions somewhere else, e.g.
+in a database.
+"""
+
+import os
+import re
+import json
+import time
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import requests
+from requests.cookies import create_cookie
+
+
+class SessionStore(ABC):
+    """Base class of session stores.
+
+    A state is a dict which can be serialized into JSON, see
+    dump_cookies for the format of the cookies in it.
+    """
+
+    @abstractmethod
+    def load(self, username: str) -> Optional[dict]:
+        """Load the state of a username.
+
+        :param username: The username.
+        :return The state, or None if not stored.
+        """
+
+    @abstractmethod
+    def save(self, username: str, state: dict):
+        """Save the state of a username.
+
+        :param username: The username.
+        :param state: The state to save.
+        """
+
+    @abstractmethod
+    def delete(self, username: str):
+        """Delete the state of a username.
+
+        :param username: The username.
+        """
+
+
+# The usernames which are safe to be file names.
+_username_pattern = re.compile(r'[0-9A-Za-z_\-][0-9A-Za-z_.\-]*')
+
+
+class FileSessionStore(SessionStore):
+    """Store the states as JSON files, one file per username.
+
+    The files contain the session cookies, so they are only readable
+    and writable by the current user.
+
+    :param directory: The directory to save the files. Default to
+        `~/.gzhmu/sessions`.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        if directory is None:
+            directory = os.path.join(os.path.expanduser('~'), '.gzhmu', 'sessions')
+        self.__directory = directory
+
+    def get_directory(self) -> str:
+        """Get the directory where the files are saved."""
+        return self.__directory
+
+    def get_path(self, username: str) -> str:
+        """Get the path of the file of a username.
+
+        :param username: The username, which may only contain letters,
+            digits, `_`, `-` and `.`, and must not start with `.`.
+        :return The path. ValueError is raised if the username is not
+            a safe file name, e.g. it contains a path separator.
+        """
+        username = str(username)
+        if _username_pattern.fullmatch(username) is None:
+            raise ValueError('invalid username for a file name: %r' % username)
+        return os.path.join(self.__directory, '%s.json' % username)
+
+    def load(self, username: str) -> Optional[dict]:
+        try:
+            with open(self.get_path(username), 'r', encoding='utf-8') as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, username: str, state: dict):
+        os.makedirs(self.__directory, mode=0o700, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.__directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                json.dump(state, fp)
+            os.replace(temp_path, self.get_path(username))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def delete(self, username: str):
+        try:
+            os.remove(self.get_path(username))
+        except FileNotFoundError:
+            pass
+
+
+def dump_cookies(cookies: requests.cookies.RequestsCookieJar) -> list:
+    """Convert a cookie jar into a list of dicts which can be serialized into JSON.
+
+    :param cookies: The cookie jar.
+    :return A list of dicts with the arguments of requests.cookies.create_cookie.
+    """
+    return [{
+        'name': cookie.name,
+        'value': cookie.value,
+        'port': cookie.port,
+        'domain': cookie.domain,
+        'path': cookie.path,
+        'secure': cookie.secure,
+        'expires': cookie.expires,
+        'discard': cookie.discard,
+        'comment': cookie.comment,
+        'comment_url': cookie.comment_url,
+        'rest': cookie._rest,
+        'rfc2109': cookie.rfc2109,
+    } for cookie in cookies]
+
+
+def load_cookies(cookies: requests.cookies.RequestsCookieJar, data: list):
+    """Put the cookies from dump_cookies into a cookie jar.
+
+    Expired cookies are dropped.
+
+    :param cookies: The cookie jar.
+    :param data: The result of dump_cookies.
+    """
+    now = time.time()
+    for kwargs in data:
+        if kwargs.get('expires') is not None and kwargs['expires'] <= now:
+            continue
+        cookies.set_cookie(create_cookie(**kwargs))
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+from Crypto.Cipher import AES
+
+from gzhmu.gzhmu import HostCipher, Gzhmu
+
+
+KEY = b'wrdvpnisthebest!'
+IV = b'wrdvpnisthebest!'
+
+
+@pytest.mark.parametrize('length', range(80))
+def test_host_cipher_matches_aes_cfb(length):
+    cipher = HostCipher(KEY, IV)
+    data = os.urandom(length)
+    encrypted = AES.new(KEY, AES.MODE_CFB, IV, segment_size=128).encrypt(data)
+    assert cipher.encrypt(data) == encrypted
+    assert cipher.decrypt(encrypted) == data
+
+
+PLAIN_URLS = [
+    'http://jwgl.gzhmu.edu.cn/jsxsd/',
+    'https://sso.gzhmu.edu.cn:8443/cas/login?service=x#top',
+    'http://a-very-long-intranet-hostname.gzhmu.edu.cn/index.html',
+    'http://192.168.12.3:801/eportal/',
+]
+
+
+def make_documents():
+    plain = []
+    encrypted = []
+    for i in range(200):
+        url = PLAIN_URLS[i % len(PLAIN_URLS)]
+        text = '<p>%d</p><a href="%%s">link</a>\n' % i
+        plain.append(text % url)
+        encrypted.append(text % Gzhmu.encrypt_url(url))
+    # Not a valid encrypted host, left as it is.
+    invalid = '<a href="https://webvpn.gzhmu.edu.cn/http/zz/">x</a>'
+    plain.append(invalid)
+    encrypted.append(invalid)
+    return ''.join(plain), ''.join(encrypted)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 16, 100, 651, 652, 4096, 65536])
+@pytest.mark.parametrize('as_bytes', [False, True])
+def test_decrypt_html_chunks(chunk_size, as_bytes):
+    plain, encrypted = make_documents()
+    if as_bytes:
+        plain, encrypted = plain.encode(), encrypted.encode()
+    chunks = [encrypted[i:i+chunk_size] for i in range(0, len(encrypted), chunk_size)]
+    result = list(Gzhmu.decrypt_html(chunks))
+    assert all(isinstance(chunk, type(plain)) for chunk in result)
+    assert plain[:0].join(result) == plain
+    assert plain[:0].join(Gzhmu.decrypt_html(encrypted)) == plain
@@ -0,0 +1,28 @@
+import datetime
+
+from gzhmu.gmulib import Seat, Record, SeatInfo
+from gzhmu.seatindex import SeatIndex
+
+
+def make_seat_info(seat_id, periods):
+    seat = Seat(1, 'lib', 10, 'room', seat_id, 'room-{:03d}'.format(seat_id))
+    records = [Record(seat, 0, 'owner', False, None, start, end) for start, end in periods]
+    return SeatInfo(seat, True, 0, records)
+
+
+def test_records_on_different_days():
+    day1 = datetime.datetime(2024, 5, 1)
+    day2 = datetime.datetime(2024, 5, 2)
+    seat0 = make_seat_info(0, [(day2.replace(hour=9), day2.replace(hour=10))])
+    seat1 = make_seat_info(1, [(day1.replace(hour=23), day1.replace(hour=23, minute=50))])
+    # The first record is on the later day, and date is given explicitly.
+    for index in (SeatIndex([seat0, seat1]), SeatIndex([seat0, seat1], day2.date())):
+        assert not index.is_free(1, day1.replace(hour=23, minute=10),
+                                 day1.replace(hour=23, minute=20))
+        assert index.is_free(0, day1.replace(hour=23, minute=10),
+                             day1.replace(hour=23, minute=20))
+        assert not index.is_free(0, day2.replace(hour=9, minute=30), day2.replace(hour=11))
+        assert index.longest_free_block(1, day1.replace(hour=22), day2.replace(hour=1)) \
+            == (day1.replace(hour=23, minute=50), day2.replace(hour=1))
+        assert index.longest_free_block(0, day1.replace(hour=22), day2.replace(hour=12)) \
+            == (day1.replace(hour=22), day2.replace(hour=9))